@@ -1,8 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from utils.executors import run_in
 
 load_dotenv(override=True)  
 
@@ -14,6 +16,14 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Blocking DB calls from async endpoints run here, apart from the default thread pool that
+# embedding/FAISS work uses, so small writes never queue behind CPU-heavy jobs
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking (sync SQLAlchemy) call on DB_EXECUTOR without blocking the event loop"""
+    return await run_in(DB_EXECUTOR, func, *args, **kwargs)
+
 def init_db():
     """Initialize database with all tables"""
     try:
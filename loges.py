@@ -1,7 +1,21 @@
+import atexit
+import queue
 import warnings
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from watchfiles import DefaultFilter
 
+def _move_handlers_off_request_path():
+    """Put the root handlers behind a QueueListener so logging calls never block on stream I/O."""
+    root = logging.getLogger()
+    if not root.handlers or any(isinstance(h, QueueHandler) for h in root.handlers):
+        return
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
 def log_check(message: str = "Loges initialized.", level: str = "DEBUG"):
     """Set up logging configuration with reduced noise from libraries."""
     numeric_level = getattr(logging, level.upper(), None)
@@ -13,6 +27,9 @@ def log_check(message: str = "Loges initialized.", level: str = "DEBUG"):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
+    # basicConfig is a no-op once any module configured the root logger; the level must still apply
+    logging.getLogger().setLevel(numeric_level)
+    _move_handlers_off_request_path()
     logging.info(message)
         # Suppress all DeprecationWarnings (including LangChain)
     # warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -1,6 +1,6 @@
-import base64
 import io
 import json
+import logging
 import os
 import re
 import secrets
@@ -25,8 +25,9 @@ from fastapi import FastAPI, WebSocket
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
-from database.db import SessionLocal
-from model.models import Contact, Website, Firm
+from database.db import SessionLocal, run_db
+from utils.openai_clients import close_openai_clients
+from model.models import CST, Contact, Website, Firm
 from model.user_models import User
 from model.admin_models import AdminUser
 from fastapi import FastAPI
@@ -61,7 +62,9 @@ ALLOWED_IFRAME_ORIGINS = os.getenv("ALLOWED_IFRAME_ORIGINS", "")  # space-separa
 
 # ---------------- Disable HuggingFace Tokenizer Warning ----------------
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-loges.log_check(message="INFO")
+# INFO by default: DEBUG output includes user transcripts and queries
+loges.log_check(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
 # ---------------- FastAPI setup ----------------
 app = FastAPI()
 contact_mgr = ContactManager()
@@ -81,6 +84,7 @@ async def startup_event():
             print("✅ OpenAI API connectivity verified!")
         else:
             print("⚠️  OpenAI API connectivity test failed - chat functionality may be limited")
+        await warm_openai_pool()
         
         # Initialize admin system
         print("🔧 Initializing admin system...")
@@ -93,6 +97,11 @@ async def startup_event():
         import traceback
         traceback.print_exc()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the shared OpenAI connection pools"""
+    await close_openai_clients()
+
 # After CORS setup
 # Configure CORS based on allowed iframe origins (if provided). Use a dynamic
 # origins list so the server can run on EC2 with a specific frontend origin.
@@ -543,7 +552,9 @@ async def save_contact(payload: ContactIn, background_tasks: BackgroundTasks):
     try:
         # prefer explicit notify_to, otherwise send to the contact's email
         notify_to = payload.notify_to or payload.email
-        contact_id = contact_mgr.save_and_notify(
+        # Sync DB insert - off the event loop, on the dedicated DB pool
+        contact_id = await run_db(
+            contact_mgr.save_and_notify,
             payload.model_dump(),
             background_tasks=background_tasks,
             notify_to=notify_to
@@ -1868,10 +1879,10 @@ async def get_admin_contacts(request: Request):
             # If datetime is naive (old records), treat as UTC and convert to CST
             if dt.tzinfo is None:
                 dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-                dt = dt.astimezone(ZoneInfo("America/Chicago"))
+                dt = dt.astimezone(CST)
             # If already has timezone (new records), convert to CST
-            elif dt.tzinfo != ZoneInfo("America/Chicago"):
-                dt = dt.astimezone(ZoneInfo("America/Chicago"))
+            elif dt.tzinfo != CST:
+                dt = dt.astimezone(CST)
             # Format as MM/DD/YYYY HH:MM:SS AM/PM
             return dt.strftime("%m/%d/%Y %I:%M:%S %p")
         
@@ -2686,7 +2697,6 @@ async def frame_headers_middleware(request: Request, call_next):
 
 
 import io
-import base64
 import os
 import uuid
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -2708,7 +2718,7 @@ async def ws_voice(ws: WebSocket):
     await ws.accept()
     
     session_id = str(uuid.uuid4())
-    print(f"🎧 Session Started: {session_id}")
+    logger.info("Voice session started: %s", session_id)
 
     # [IMPORTANT] Frontend ko batao session ID mil gaya
     await ws.send_json({"session_id": session_id})
@@ -2716,29 +2726,27 @@ async def ws_voice(ws: WebSocket):
     try:
         # Initial Greeting
         greeting = "Hello! I am your DJF Law Firm AI Assistant, How can I help you?"
-        await voice_assistant.safe_send(ws, greeting)
+        await voice_assistant.safe_send(ws, greeting, cache=True)
 
         while True:
             try:
-                data = await ws.receive_json()
+                data = await receive_voice_message(ws)
             except WebSocketDisconnect:
                 break
             
             # Handle Stop Signal
             if data.get("stop"):
-                print("🛑 User stopped manually")
+                logger.debug("User stopped manually: %s", session_id)
                 # Yahan break nahi karenge, bas current processing rukegi
                 # kyunki 'safe_send' async hai, wo loop ko block nahi karega
                 continue
 
-            if data.get("audio"):
-                audio_bytes = base64.b64decode(data["audio"])
-                await voice_assistant.process_audio(ws, audio_bytes, session_id)
+            if data.get("audio_bytes"):
+                await voice_assistant.process_audio(ws, data["audio_bytes"], session_id)
 
     except Exception as e:
-        print(f"Connection Error: {e}")
+        logger.error("Voice connection error: %s", e)
     finally:
-        if session_id in voice_assistant.sessions:
-            del voice_assistant.sessions[session_id]
-        print(f"🔒 Session Closed: {session_id}")
+        voice_assistant.end_session(session_id)
+        logger.info("Voice session closed: %s", session_id)
         
\ No newline at end of file
@@ -4,9 +4,12 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from database.db import Base
 
+# Shared tzinfo instance - resolve the zone once instead of on every call
+CST = ZoneInfo("America/Chicago")
+
 # Helper function to get current CST time
 def get_cst_now():
-    return datetime.now(ZoneInfo("America/Chicago"))
+    return datetime.now(CST)
 
 
 class Firm(Base):
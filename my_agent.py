@@ -1,16 +1,18 @@
 import io
-import base64
 import os
 import uuid
+import logging
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from voice_config.voice_helper import *
+from utils.openai_clients import close_openai_clients
 # ----------------------------------
 # ENVIRONMENT SETUP
 # ----------------------------------
 load_dotenv(override=True)
+logger = logging.getLogger(__name__)
 # ========================================
 # FASTAPI SETUP
 # ========================================
@@ -19,6 +21,10 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 voice_assistant = VoiceAssistant()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_openai_clients()
+
 @app.get("/voice")
 async def get_index():
     return FileResponse("static/voice.html")
@@ -29,35 +35,35 @@ async def ws_voice(ws: WebSocket):
     await ws.accept()
     session_id = str(ws.client.host)  # or uuid.uuid4() for uniqueness
     session_id = str(uuid.uuid4())
-    print(f"🎧 Voice session started: {session_id}")
+    logger.info("Voice session started: %s", session_id)
 
     try:
         # Send greeting
         greeting = "Hello! I’m your AI voice assistant. How can I help you today?"
-        await voice_assistant.safe_send(ws, greeting)
+        await voice_assistant.safe_send(ws, greeting, cache=True)
 
         # Listen loop
         while True:
             try:
-                data = await ws.receive_json()
+                data = await receive_voice_message(ws)
             except WebSocketDisconnect:
-                print("⚠️ Client disconnected during receive.")
+                logger.debug("Client disconnected during receive: %s", session_id)
                 break
 
-            if not data.get("audio") or data.get("silence"):
+            if not data.get("audio_bytes") or data.get("silence"):
                 continue
 
-            audio_bytes = base64.b64decode(data["audio"])
-            exit_signal = await voice_assistant.process_audio(ws, audio_bytes, session_id)
+            exit_signal = await voice_assistant.process_audio(ws, data["audio_bytes"], session_id)
             if exit_signal == "exit":
                 break
 
     except Exception as e:
-        print(f"💥 WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
+        voice_assistant.end_session(session_id)
         if ws.client_state.name == "CONNECTED":
             await ws.close()
-        print(f"🔒 Session {session_id} closed.")
+        logger.info("Voice session closed: %s", session_id)
 
 
         
\ No newline at end of file
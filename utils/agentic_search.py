@@ -4,12 +4,16 @@ Converts traditional RAG to agentic approach with iterative search strategies
 """
 
 import os
+import re
 from typing import List, Dict, Any, Optional
 from openai import OpenAI
 
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Leading list numbering ("1.", "2)") and/or bullet ("-", "•", "*") on generated query lines
+LIST_MARKER_PATTERN = re.compile(r'^(?:\d+[.)]\s*)?(?:[-•*]\s*)?')
+
 
 class AgenticSearchAgent:
     """
@@ -177,11 +181,8 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
             # Clean queries (remove any numbering or bullet points)
             clean_queries = []
             for q in queries:
-                cleaned = q.strip()
-                # Remove numbering like "1.", "2)", etc.
-                cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
-                # Remove bullet points
-                cleaned = re.sub(r'^[-•*]\s*', '', cleaned)
+                # Remove numbering like "1.", "2)", etc. and bullet points in one pass
+                cleaned = LIST_MARKER_PATTERN.sub('', q.strip(), count=1)
                 if cleaned and len(cleaned) > 3:
                     clean_queries.append(cleaned)
             
@@ -202,7 +203,6 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
         Smart fallback when LLM query generation fails
         Uses linguistic patterns to generate alternatives
         """
-        import re
         
         base_queries = [query]
         query_lower = query.lower()
@@ -249,6 +249,41 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
         
         return list(dict.fromkeys(base_queries))[:5]  # Remove duplicates, max 5
     
+    @staticmethod
+    def _format_hits(
+        results: Optional[Dict[str, Any]],
+        query_used: str,
+        strategy: str,
+        default_score: float,
+        penalty: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn a search response into result dicts. The response layout (flat lists or
+        Chroma-style one-row-per-query nesting, optional distances) is resolved once,
+        not re-probed with .get() fallbacks for every hit.
+        """
+        if not results or not results.get("documents"):
+            return []
+        
+        docs = results["documents"]
+        metadatas = results.get("metadatas") or []
+        distances = results.get("distances") or []
+        if isinstance(docs[0], list):  # Chroma-compatible query(): [[...]] per query
+            docs = docs[0]
+            metadatas = metadatas[0] if metadatas else []
+            distances = distances[0] if distances else []
+        
+        return [
+            {
+                "content": doc,
+                "metadata": metadatas[idx] if idx < len(metadatas) else {},
+                "score": (distances[idx] if idx < len(distances) else default_score) + penalty,
+                "query_used": query_used,
+                "search_strategy": strategy
+            }
+            for idx, doc in enumerate(docs)
+        ]
+    
     async def _execute_search(
         self, 
         query: str, 
@@ -269,17 +304,7 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
                 where=where_filter
             )
             
-            formatted_results = []
-            if results and "documents" in results:
-                for idx, doc in enumerate(results["documents"]):
-                    score = results.get("distances", [0])[idx] if results.get("distances") else 0
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": results.get("metadatas", [{}])[idx],
-                        "score": score,
-                        "query_used": query,
-                        "search_strategy": "standard"
-                    })
+            formatted_results = self._format_hits(results, query, "standard", default_score=0)
             
             # Strategy 2: If few results, try broader search with individual keywords
             if len(formatted_results) < 3:
@@ -292,18 +317,10 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
                             where=where_filter
                         )
                         
-                        if keyword_results and "documents" in keyword_results:
-                            for idx, doc in enumerate(keyword_results["documents"]):
-                                score = keyword_results.get("distances", [0.9])[idx]
-                                # Add penalty for keyword-only search
-                                score = score + 0.2  
-                                formatted_results.append({
-                                    "content": doc,
-                                    "metadata": keyword_results.get("metadatas", [{}])[idx],
-                                    "score": score,
-                                    "query_used": keyword,
-                                    "search_strategy": "keyword_expansion"
-                                })
+                        # Add penalty for keyword-only search
+                        formatted_results.extend(self._format_hits(
+                            keyword_results, keyword, "keyword_expansion", default_score=0.9, penalty=0.2
+                        ))
             
             # Strategy 3: For hours queries, try footer-specific search
             hours_keywords = ['hours', 'open', 'close', 'operation', 'schedule']
@@ -315,16 +332,9 @@ Return ONLY the search queries, one per line, no explanations or numbering."""
                     where=where_filter
                 )
                 
-                if footer_results and "documents" in footer_results:
-                    for idx, doc in enumerate(footer_results["documents"]):
-                        score = footer_results.get("distances", [0.8])[idx]
-                        formatted_results.append({
-                            "content": doc,
-                            "metadata": footer_results.get("metadatas", [{}])[idx],
-                            "score": score,
-                            "query_used": footer_query,
-                            "search_strategy": "footer_targeted"
-                        })
+                formatted_results.extend(self._format_hits(
+                    footer_results, footer_query, "footer_targeted", default_score=0.8
+                ))
             
             return formatted_results
             
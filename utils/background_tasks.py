@@ -16,6 +16,8 @@ class TaskStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+FINISHED_STATUSES = frozenset({TaskStatus.COMPLETED.value, TaskStatus.FAILED.value})
+
 class TaskManager:
     def __init__(self, max_concurrent_tasks: int = 3):
         self.tasks: Dict[str, Dict] = {}
@@ -166,9 +168,10 @@ class TaskManager:
         
         async with self._lock:
             to_remove = []
+            # Full scan: created_at is naive wall-clock time, which can step backwards (DST,
+            # clock sync), so insertion order doesn't guarantee age order
             for task_id, task in self.tasks.items():
-                if (task["created_at"] < cutoff_time and 
-                    task["status"] in [TaskStatus.COMPLETED.value, TaskStatus.FAILED.value]):
+                if task["created_at"] < cutoff_time and task["status"] in FINISHED_STATUSES:
                     to_remove.append(task_id)
             
             for task_id in to_remove:
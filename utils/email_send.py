@@ -8,7 +8,6 @@ from database.db import SessionLocal
 from model.models import Contact
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
 import re
 
 load_dotenv(override=False)
@@ -23,7 +22,7 @@ import re
 from typing import Optional, Dict
 from dotenv import load_dotenv
 from database.db import SessionLocal
-from model.models import Contact
+from model.models import Contact, CST
 from sqlalchemy.exc import SQLAlchemyError
 
 load_dotenv(override=False)
@@ -62,7 +61,7 @@ class ContactManager:
         # Convert to CST timezone
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        dt_cst = dt.astimezone(ZoneInfo("America/Chicago"))
+        dt_cst = dt.astimezone(CST)
         return dt_cst.strftime("%a, %d %b %Y %I:%M %p CST")
 
     def _valid_email(self, email: Optional[str]) -> bool:
@@ -75,7 +74,7 @@ class ContactManager:
         return ""
 
     def _build_team_email(self, contact: Dict, notify_to: Optional[str] = None) -> EmailMessage:
-        sent_dt = datetime.now(ZoneInfo("America/Chicago"))
+        sent_dt = datetime.now(CST)
         sent_readable = sent_dt.strftime("%a, %d %b %Y %I:%M %p CST")
         recipient = self._get_recipient(contact, notify_to)
 
@@ -126,7 +125,7 @@ class ContactManager:
         if not self._valid_email(user_email):
             return None
 
-        sent_dt = datetime.now(ZoneInfo("America/Chicago"))
+        sent_dt = datetime.now(CST)
         sent_readable = sent_dt.strftime("%a, %d %b %Y %I:%M %p CST")
         # Use same timestamp for submitted time
         created_at_readable = sent_readable
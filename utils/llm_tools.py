@@ -1,7 +1,9 @@
 # utils/chat_service.py
 
 import re
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Tuple, List, Optional
 from fastapi.responses import JSONResponse
@@ -34,12 +36,12 @@ else:
     print("❌ OpenAI API key not found in environment variables")
 
 # ---------------- LLM Setup with Error Handling ----------------
-def create_llm_client():
+def create_llm_client(api_key: str = OPENAI_API_KEY):
     """Create LLM client with proper timeout and retry settings"""
     try:
         # Create direct OpenAI client as fallback
         openai_client = OpenAI(
-            api_key=OPENAI_API_KEY,
+            api_key=api_key,
             timeout=30.0,  # 30 second timeout
             max_retries=3
         )
@@ -53,7 +55,7 @@ def create_llm_client():
         llm = ChatOpenAI(
             model_name="gpt-4o", 
             temperature=0, 
-            openai_api_key=OPENAI_API_KEY,
+            openai_api_key=api_key,
             http_client=custom_http_client,
             request_timeout=30
         )
@@ -65,6 +67,51 @@ def create_llm_client():
 
 llm, openai_client = create_llm_client()
 
+# Clients for caller-supplied API keys, least recently used first
+MAX_KEYED_CLIENTS = 32
+_keyed_clients: "OrderedDict[str, tuple]" = OrderedDict()
+_keyed_clients_lock = threading.Lock()
+
+def _close_llm_clients(llm_client, direct_client):
+    """Release the connection pools held by a (llm, openai_client) pair"""
+    for client in (getattr(llm_client, "http_client", None), direct_client):
+        try:
+            if client is not None:
+                client.close()
+        except Exception as e:
+            print(f"Error closing LLM client: {e}")
+
+def get_llm_clients_for_key(api_key: str):
+    """(llm, openai_client) for a caller-supplied API key - built once per key, not per request.
+
+    Failed creations are not cached (the next call retries), and clients evicted from the
+    LRU are closed so their httpx pools don't leak.
+    """
+    with _keyed_clients_lock:
+        clients = _keyed_clients.get(api_key)
+        if clients is not None:
+            _keyed_clients.move_to_end(api_key)
+            return clients
+
+    clients = create_llm_client(api_key)
+    if clients[0] is None:
+        return clients
+
+    evicted = []
+    with _keyed_clients_lock:
+        if api_key in _keyed_clients:
+            # Another thread built this key's clients meanwhile - keep theirs, drop ours
+            evicted.append(clients)
+            clients = _keyed_clients[api_key]
+            _keyed_clients.move_to_end(api_key)
+        else:
+            _keyed_clients[api_key] = clients
+            while len(_keyed_clients) > MAX_KEYED_CLIENTS:
+                evicted.append(_keyed_clients.popitem(last=False)[1])
+    for old in evicted:
+        _close_llm_clients(*old)
+    return clients
+
 def test_connectivity():
     """Test connectivity to OpenAI API"""
     try:
@@ -97,32 +144,10 @@ def call_llm_with_fallback(prompt_text: str, max_retries: int = 3, custom_api_ke
     
     if custom_api_key:
         print("Using custom API key for LLM call")
-        # Create temporary client with custom API key
-        try:
-            custom_openai_client = OpenAI(
-                api_key=custom_api_key,
-                timeout=30.0,
-                max_retries=3
-            )
+        # Clients (and their connection pools) for this key are reused across calls
+        active_llm, custom_openai_client = get_llm_clients_for_key(custom_api_key)
+        if custom_openai_client is not None:
             active_openai_client = custom_openai_client
-            
-            # Create custom LangChain client (httpx already imported at top)
-            custom_http_client = httpx.Client(
-                timeout=30.0,
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
-            )
-            
-            active_llm = ChatOpenAI(
-                model_name="gpt-4o", 
-                temperature=0, 
-                openai_api_key=custom_api_key,
-                http_client=custom_http_client,
-                request_timeout=30
-            )
-        except Exception as e:
-            print(f"Error creating custom LLM client: {e}")
-            # Fall back to direct API call only
-            active_llm = None
     
     # Try LangChain ChatOpenAI first
     for attempt in range(max_retries):
@@ -220,6 +245,23 @@ def load_firm_and_links(firm_id: int) -> Tuple[str, List[str]]:
         db.close()
 
 
+# ---------------- Helper: Build Bounded Context ----------------
+def join_within_limit(parts: List[str], limit: int, sep: str = " ", per_part: Optional[int] = None) -> str:
+    """Join parts until `limit` chars, truncating the last one - never builds the full joined string"""
+    buf, total = [], 0
+    for part in parts:
+        if per_part:
+            part = part[:per_part]
+        room = limit - total
+        if len(part) > room:
+            if room > 0:
+                buf.append(part[:room])
+            break
+        buf.append(part)
+        total += len(part) + len(sep)
+    return sep.join(buf)
+
+
 # ---------------- Main: Get Answer ----------------
 def get_answer_from_db(query: str, firm_id: int = None, session_id: Optional[str] = None, url_context: Optional[str] = None, custom_api_key: str = None) -> str:
     """Get answer from database - supports both firm_id and URL-specific context"""
@@ -227,7 +269,7 @@ def get_answer_from_db(query: str, firm_id: int = None, session_id: Optional[str
 
     try:
         # 1️⃣ Embed user query
-        query_embedding = embedding_model.encode(query).tolist()
+        query_embedding = embedding_model.encode(query)
 
         docs = []
         firm_name = "Assistant"
@@ -280,7 +322,7 @@ def get_answer_from_db(query: str, firm_id: int = None, session_id: Optional[str
                     # Create mock vector store wrapper for agentic agent
                     class VectorStoreWrapper:
                         def search(self, query_text, n_results=5, where=None):
-                            emb = embedding_model.encode(query_text).tolist()
+                            emb = embedding_model.encode(query_text)
                             res = collection.query(
                                 query_embeddings=[emb],
                                 n_results=n_results,
@@ -315,8 +357,8 @@ def get_answer_from_db(query: str, firm_id: int = None, session_id: Optional[str
         
         # 4️⃣ Merge retrieved docs + context
         MAX_DOC_CHARS = 5000
-        docs = [d[:MAX_DOC_CHARS] for d in docs]
-        context_text = " ".join(docs)
+        MAX_CONTEXT_CHARS = 20000
+        context_text = join_within_limit(docs, MAX_CONTEXT_CHARS, per_part=MAX_DOC_CHARS)
 
         # 5️⃣ Generate prompt (use session memory suggestions)
         is_followup = bool(session_memory.get("previous_suggestions"))
@@ -348,7 +390,7 @@ def get_answer_from_db(query: str, firm_id: int = None, session_id: Optional[str
             answer_text = response_text
 
         # 9️⃣ Store assistant answer in vector DB
-        answer_embedding = embedding_model.encode(answer_text).tolist()
+        answer_embedding = embedding_model.encode(answer_text)
         collection.add(
             ids=[f"assistant_{session_id}_{uuid.uuid4()}"],
             embeddings=[answer_embedding],
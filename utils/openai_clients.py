@@ -0,0 +1,57 @@
+# utils/openai_clients.py
+
+"""
+Process-wide OpenAI clients - created lazily on first use and shared by every
+agent/session, so each worker process holds one connection pool instead of one per instance.
+"""
+
+import os
+from functools import lru_cache
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Shared sync client (used from worker threads)"""
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=2,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=300.0),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared async client with a keep-alive pool, so voice turns reuse warm TLS connections"""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=2,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300.0),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        ),
+    )
+
+
+async def close_openai_clients():
+    """Close the pooled connections on shutdown (only clients that were actually created)"""
+    if get_openai_client.cache_info().currsize:
+        get_openai_client().close()
+    if get_async_openai_client.cache_info().currsize:
+        await get_async_openai_client().close()
+    _reset_after_fork()
+
+
+def _reset_after_fork():
+    # Connection pools must not be shared between processes - rebuild lazily in the child
+    get_openai_client.cache_clear()
+    get_async_openai_client.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
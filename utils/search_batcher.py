@@ -0,0 +1,89 @@
+# utils/search_batcher.py
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SearchFn = Callable[[np.ndarray, int], List[List[Dict[str, Any]]]]
+
+
+class BatchingSearcher:
+    """
+    Coalesces vector searches from concurrent sessions into one FAISS call.
+
+    Requests arriving within `window_ms` of the first queued one (up to `max_rows` query
+    vectors) are stacked into a single matrix and searched together off the event loop,
+    then each caller gets back its own rows.
+    """
+
+    def __init__(self, search_fn: SearchFn, max_rows: int = 32, window_ms: float = 10.0,
+                 executor: Optional[Executor] = None):
+        self.search_fn = search_fn  # (query matrix, n_results) -> one result list per row
+        self.executor = executor  # None -> the loop's default executor
+        self.max_rows = max_rows
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def search(self, vectors: np.ndarray, n_results: int = 10) -> List[List[Dict[str, Any]]]:
+        """Search one or more query vectors; resolves once the batch they landed in is done"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Queue and worker belong to the loop that created them
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((np.atleast_2d(vectors), n_results, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent sessions one window to join, then drain what arrived
+            await asyncio.sleep(self.window)
+            rows = len(batch[0][0])
+            while rows < self.max_rows and not self._queue.empty():
+                item = self._queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+            await self._search_batch(batch)
+
+    async def _search_batch(self, batch: List[tuple]):
+        try:
+            matrix = np.vstack([vectors for vectors, _, _ in batch])
+            n_results = max(n for _, n, _ in batch)
+            result_rows = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.search_fn, matrix, n_results
+            )
+        except Exception as e:
+            logger.error("Batched search error: %s", e)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        offset = 0
+        for vectors, n, future in batch:
+            if not future.done():  # caller may have been cancelled meanwhile
+                # Rows are score-ordered, so a smaller n_results is just a prefix
+                future.set_result([row[:n] for row in result_rows[offset:offset + len(vectors)]])
+            offset += len(vectors)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
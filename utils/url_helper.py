@@ -1,3 +1,7 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
 import requests
 from bs4 import BeautifulSoup
 
@@ -13,8 +17,108 @@ def fetch(url):
         print(f"[WARN] Failed to fetch {url}: {e}")
         return ""
 
-def clean_html(html):
-    soup = BeautifulSoup(html, "html.parser")
+def clean_html(html, from_encoding=None):
+    # from_encoding: charset from the HTTP Content-Type header when `html` is raw bytes
+    # (takes precedence over <meta charset> sniffing, as in a browser)
+    soup = BeautifulSoup(html, "html.parser", from_encoding=from_encoding)
     for t in soup(["script", "style", "noscript"]):
         t.decompose()
     return soup
+
+
+# Shared by the crawlers in utils/scraper.py and utils/voice_scraper.py
+# Everything but digits and '+', stripped before the phone-length check
+PHONE_NOISE_PATTERN = re.compile(r'[^0-9+]')
+
+# Class/id matchers for footer & contact blocks (case-insensitive substring match in C)
+FOOTER_ATTR_PATTERN = re.compile(r'footer|contact|hours|info', re.I)
+HOURS_CLASS_PATTERN = re.compile(r'hours|schedule|open', re.I)
+PHONE_CLASS_PATTERN = re.compile(r'phone|tel|hours', re.I)
+# Short text fragments are kept only if they look like time/contact info
+TEXT_KEYWORD_PATTERN = re.compile(r'am|pm|hours|phone|email|@', re.I)
+
+# Elements whose text is collected as general page content
+TEXT_TAGS = frozenset(["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "div", "span", "article", "section", "td", "th", "time", "address", "label"])
+# itemprop values treated as contact info, in output order
+CONTACT_ITEMPROPS = ("openingHours", "telephone", "address")
+# hrefs that never point at another crawlable page
+SKIP_HREF_PREFIXES = ("#", "javascript:", "mailto:", "tel:")
+
+
+def collect_elements(soup):
+    """Walk the DOM once and bucket elements for the footer, contact, text and link passes.
+
+    Each bucket keeps document order and corresponds to one of the old
+    find_all/select calls, so concatenating them gives the same sequence
+    (an element matching several selectors still appears in each).
+    Returns (footer_elements, contact_elements, text_elements, anchors).
+    """
+    footer_by_class, footer_by_id = [], []
+    times, addresses, hours_divs, phone_spans = [], [], [], []
+    by_itemprop = {prop: [] for prop in CONTACT_ITEMPROPS}
+    text_elements = []
+    anchors = []
+
+    for el in soup.find_all(True):
+        name = el.name
+        classes = el.get("class")
+        class_str = " ".join(classes) if isinstance(classes, list) else (classes or "")
+
+        if name == "footer" or name == "div":
+            if class_str and FOOTER_ATTR_PATTERN.search(class_str):
+                footer_by_class.append(el)
+            el_id = el.get("id")
+            if el_id and FOOTER_ATTR_PATTERN.search(el_id):
+                footer_by_id.append(el)
+
+        if name == "time":
+            times.append(el)
+        elif name == "address":
+            addresses.append(el)
+        elif name == "div":
+            if class_str and HOURS_CLASS_PATTERN.search(class_str):
+                hours_divs.append(el)
+        elif name == "span":
+            if class_str and PHONE_CLASS_PATTERN.search(class_str):
+                phone_spans.append(el)
+
+        itemprop = el.get("itemprop")
+        if itemprop in by_itemprop:
+            by_itemprop[itemprop].append(el)
+
+        if name in TEXT_TAGS:
+            text_elements.append(el)
+        elif name == "a" and el.get("href") is not None:
+            anchors.append(el)
+
+    contact_elements = times + addresses
+    for prop in CONTACT_ITEMPROPS:
+        contact_elements += by_itemprop[prop]
+    contact_elements += hours_divs + phone_spans
+    return footer_by_class + footer_by_id, contact_elements, text_elements, anchors
+
+
+@lru_cache(maxsize=128)
+def _domain_prefixes(domain: str):
+    """Return (roots, prefixes) for http(s) URLs whose netloc is exactly `domain`."""
+    roots = (f"https://{domain}", f"http://{domain}")
+    return roots, tuple(root + sep for root in roots for sep in "/?#")
+
+
+def is_internal_url(href: str, domain: str) -> bool:
+    """Same result as `urlparse(href).netloc == domain` for http(s) URLs, via str.startswith."""
+    roots, prefixes = _domain_prefixes(domain)
+    return href.startswith(prefixes) or href in roots
+
+
+@lru_cache(maxsize=10000)
+def normalize_url(url: str) -> str:
+    """Canonical form of `url` used as the crawl dedup key.
+
+    Lowercases scheme/host, sorts query params, drops the fragment and any
+    trailing slash so equivalent URLs count once against MAX_PAGES.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
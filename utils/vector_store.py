@@ -23,14 +23,33 @@ DOCUMENTS_FILE = os.path.join(PERSIST_DIR, "documents.json")
 embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
 EMBEDDING_DIM = 384  # Dimension for paraphrase-multilingual-MiniLM-L12-v2
 
+# "flat" = exact fp32 inner product; "sq8" = 8-bit scalar quantized (4x less memory per vector);
+# "hnsw" = approximate graph search, sub-linear in the number of vectors;
+# "ivf" = inverted lists, scans only `nprobe` of IVF_NLIST clusters per query
+INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat").lower()
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))  # higher = better recall, slower search
+IVF_NLIST = 100
+IVF_NPROBE = int(os.getenv("FAISS_IVF_NPROBE", "10"))  # higher = better recall, slower search
+IVF_MIN_VECTORS = 10_000  # IVF needs data to train centroids; smaller stores stay exact flat
+
+def is_chat_row(metadata: Optional[Dict[str, Any]]) -> bool:
+    """True for stored chat turns (type "chat"), as opposed to scraped/ingested knowledge-base chunks"""
+    return bool(metadata) and metadata.get("type") == "chat"
+
 class FAISSVectorStore:
-    def __init__(self):
+    def __init__(self, index_type: str = INDEX_TYPE, ef_search: int = HNSW_EF_SEARCH, nprobe: int = IVF_NPROBE):
+        self.index_type = index_type
+        self.ef_search = ef_search
+        self.nprobe = nprobe
         self.index = None
         self.metadata = {}  # id -> metadata mapping
         self.documents = {}  # id -> document text mapping
         self.id_to_index = {}  # document_id -> faiss_index mapping
         self.index_to_id = {}  # faiss_index -> document_id mapping
         self.next_index = 0
+        self.version = 0  # bumped on knowledge-base adds/deletes so answer caches built on old content can be dropped
         
         self.load_or_create_index()
     
@@ -58,21 +77,103 @@ class FAISSVectorStore:
                     self.documents = json.load(f)
                 
                 print(f"[FAISSVectorStore] Loaded existing index with {self.index.ntotal} vectors")
+                
+                if not self._is_configured_index(self.index):
+                    self._convert_index()
+                else:
+                    self._apply_search_params()
             else:
                 # Create new index
-                self.index = faiss.IndexFlatIP(EMBEDDING_DIM)  # Inner product for similarity
+                self.index = self._new_index()
                 print(f"[FAISSVectorStore] Created new FAISS index")
                 
         except Exception as e:
             print(f"[FAISSVectorStore] Error loading index: {e}")
             # Create new index if loading fails
-            self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+            self.index = self._new_index()
             self.metadata = {}
             self.documents = {}
             self.id_to_index = {}
             self.index_to_id = {}
             self.next_index = 0
     
+    def _new_index(self):
+        """Create an empty index of the configured type (inner product over normalized vectors)"""
+        if self.index_type == "sq8":
+            index = faiss.IndexScalarQuantizer(
+                EMBEDDING_DIM, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            # Vectors are L2-normalized, so every component lies in [-1, 1]: train on that fixed
+            # range rather than on whatever the first add() holds (often a single vector, whose
+            # per-dimension min/max would clip every later vector)
+            unit = np.eye(EMBEDDING_DIM, dtype=np.float32)
+            index.train(np.vstack([unit, -unit]))
+            return index
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = self.ef_search
+            return index
+        # "ivf" also starts flat: centroids are trained by _build_index once there is enough data
+        return faiss.IndexFlatIP(EMBEDDING_DIM)
+    
+    def _is_configured_index(self, index) -> bool:
+        """Check whether a loaded index already has the configured type"""
+        if self.index_type == "sq8":
+            return isinstance(index, faiss.IndexScalarQuantizer)
+        if self.index_type == "hnsw":
+            return isinstance(index, faiss.IndexHNSWFlat)
+        if self.index_type == "ivf":
+            return isinstance(index, faiss.IndexIVFFlat) or (
+                isinstance(index, faiss.IndexFlatIP) and index.ntotal < IVF_MIN_VECTORS
+            )
+        return isinstance(index, faiss.IndexFlatIP)
+    
+    def _apply_search_params(self):
+        """Re-apply query-time knobs (and the IVF id map) on a loaded or rebuilt index"""
+        if isinstance(self.index, faiss.IndexHNSWFlat):
+            self.index.hnsw.efSearch = self.ef_search
+        elif isinstance(self.index, faiss.IndexIVFFlat):
+            self.index.nprobe = self.nprobe
+            self.index.make_direct_map()  # reconstruct() needs it when rebuilding after deletes
+    
+    def set_nprobe(self, nprobe: int):
+        """Trade IVF search speed for recall at runtime (no effect on other index types)"""
+        self.nprobe = nprobe
+        self._apply_search_params()
+    
+    def _build_index(self, vectors: np.ndarray):
+        """Replace the index with one of the configured type holding `vectors` (positions preserved)"""
+        if self.index_type == "ivf" and len(vectors) >= IVF_MIN_VECTORS:
+            quantizer = faiss.IndexFlatIP(EMBEDDING_DIM)
+            self.index = faiss.IndexIVFFlat(quantizer, EMBEDDING_DIM, IVF_NLIST, faiss.METRIC_INNER_PRODUCT)
+            self.index.train(vectors)
+            self.index.add(vectors)
+        else:
+            self.index = self._new_index()
+            if len(vectors):
+                self._add_vectors(vectors)
+        self._apply_search_params()
+    
+    def _add_vectors(self, vectors: np.ndarray):
+        """Add normalized vectors, training the quantizer on the first batch if the index needs it"""
+        if not self.index.is_trained:
+            self.index.train(vectors)
+        self.index.add(vectors)
+    
+    def _convert_index(self):
+        """Re-encode a persisted index into the configured type, keeping vector positions"""
+        old_index = self.index
+        if isinstance(old_index, faiss.IndexIVF):
+            old_index.make_direct_map()
+        if old_index.ntotal:
+            vectors = old_index.reconstruct_n(0, old_index.ntotal)
+        else:
+            vectors = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._build_index(vectors)
+        print(f"[FAISSVectorStore] Converted index to '{self.index_type}' ({self.index.ntotal} vectors)")
+        self.save_index()
+    
     def save_index(self):
         """Save FAISS index and metadata to disk with automatic deduplication"""
         try:
@@ -199,8 +300,9 @@ class FAISSVectorStore:
         
         return expanded
     
-    def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: Optional[List[str]] = None):
-        """Add documents to the FAISS index"""
+    def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: Optional[List[str]] = None,
+                      embeddings=None):
+        """Add documents to the FAISS index (reuses precomputed embeddings when given)"""
         if not texts:
             return
         
@@ -209,13 +311,16 @@ class FAISSVectorStore:
             ids = [str(uuid.uuid4()) for _ in texts]
         
         # Generate embeddings
-        embeddings = embedding_model.encode(texts)
+        if embeddings is None:
+            embeddings = embedding_model.encode(texts)
+        else:
+            embeddings = np.array(embeddings, dtype=np.float32).reshape(len(texts), EMBEDDING_DIM)
         
         # Normalize embeddings for cosine similarity
         faiss.normalize_L2(embeddings)
         
         # Add to FAISS index
-        self.index.add(embeddings)
+        self._add_vectors(embeddings)
         
         # Update mappings and metadata
         for i, (text, metadata, doc_id) in enumerate(zip(texts, metadatas, ids)):
@@ -227,6 +332,9 @@ class FAISSVectorStore:
             self.documents[doc_id] = text
         
         self.next_index += len(texts)
+        # Stored chat answers (llm_tools, one per chat turn) are not knowledge-base content
+        if any(not is_chat_row(metadata) for metadata in metadatas):
+            self.version += 1
         
         # Save to disk
         self.save_index()
@@ -268,18 +376,36 @@ class FAISSVectorStore:
 
     def search(self, query: str, n_results: int = 10, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search for similar documents"""
+        return self.search_batch([query], n_results=n_results, filter_metadata=filter_metadata)[0]
+    
+    def search_batch(self, queries: List[str], n_results: int = 10, filter_metadata: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Search several queries with one encode + one FAISS call; returns one result list per query"""
+        if self.index.ntotal == 0 or not queries:
+            return [[] for _ in queries]
+        
+        # Generate query embeddings (batched)
+        query_embeddings = embedding_model.encode(queries)
+        return self.search_vectors(query_embeddings, n_results=n_results, filter_metadata=filter_metadata)
+    
+    def search_vectors(self, query_embeddings, n_results: int = 10, filter_metadata: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Search with precomputed query embeddings (one row per query); returns one result list per row"""
+        query_embeddings = np.array(query_embeddings, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
         if self.index.ntotal == 0:
-            return []
-        
-        # Generate query embedding
-        query_embedding = embedding_model.encode([query])
-        faiss.normalize_L2(query_embedding)
+            return [[] for _ in range(len(query_embeddings))]
+        faiss.normalize_L2(query_embeddings)
         
         # Search in FAISS
-        scores, indices = self.index.search(query_embedding, min(n_results * 2, self.index.ntotal))  # Get more results for filtering
+        scores, indices = self.index.search(query_embeddings, min(n_results * 2, self.index.ntotal))  # Get more results for filtering
         
+        return [
+            self._collect_results(row_scores, row_indices, n_results, filter_metadata)
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+    
+    def _collect_results(self, scores, indices, n_results: int, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Turn one row of FAISS hits into result dicts, applying the metadata filter"""
         results = []
-        for score, idx in zip(scores[0], indices[0]):
+        for score, idx in zip(scores, indices):
             if idx == -1:  # Invalid index
                 continue
                 
@@ -319,11 +445,13 @@ class FAISSVectorStore:
         
         deleted_count = 0
         indices_to_remove = []
+        knowledge_changed = False
         
         for doc_id in ids:
             if doc_id in self.id_to_index:
                 faiss_idx = self.id_to_index[doc_id]
                 indices_to_remove.append(faiss_idx)
+                knowledge_changed = knowledge_changed or not is_chat_row(self.metadata[doc_id])
                 
                 # Remove from mappings
                 del self.id_to_index[doc_id]
@@ -335,6 +463,8 @@ class FAISSVectorStore:
         if indices_to_remove:
             # FAISS doesn't support direct deletion, so we need to rebuild the index
             self._rebuild_index_without_indices(indices_to_remove)
+            if knowledge_changed:
+                self.version += 1
             self.save_index()
         
         print(f"[FAISSVectorStore] Deleted {deleted_count} documents")
@@ -375,12 +505,7 @@ class FAISSVectorStore:
                     new_next_index += 1
         
         # Create new index
-        if all_vectors:
-            vectors_array = np.array(all_vectors)
-            self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
-            self.index.add(vectors_array)
-        else:
-            self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        self._build_index(np.array(all_vectors, dtype=np.float32).reshape(-1, EMBEDDING_DIM))
         
         # Update mappings
         self.id_to_index = new_id_to_index
@@ -411,15 +536,13 @@ class FAISSVectorStore:
         ChromaDB-compatible query method for backward compatibility
         """
         if query_texts:
-            query = query_texts[0]  # Use first query text
-        elif query_embeddings:
-            # Convert embedding back to text (this is a limitation, but for compatibility)
-            query = ""  # We'll search with empty query, filtered by metadata
+            results = self.search(query=query_texts[0], n_results=n_results, filter_metadata=where)  # Use first query text
+        elif query_embeddings is not None and len(query_embeddings):
+            # Search directly with the caller's embedding (numpy arrays or lists)
+            results = self.search_vectors(query_embeddings[:1], n_results=n_results, filter_metadata=where)[0]
         else:
             return {"documents": [[]], "metadatas": [[]], "ids": [[]]}
         
-        results = self.search(query=query, n_results=n_results, filter_metadata=where)
-        
         # Convert to ChromaDB format
         documents = []
         metadatas = []
@@ -474,7 +597,7 @@ class FAISSVectorStore:
         """
         ChromaDB-compatible add method for backward compatibility
         """
-        self.add_documents(texts=documents, metadatas=metadatas, ids=ids)
+        self.add_documents(texts=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
 
     def delete(self, ids: List[str]):
         """
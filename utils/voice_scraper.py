@@ -7,11 +7,15 @@ import re
 import time
 import logging
 from collections import deque
+from typing import Optional
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
 import httpx
 
-from utils.url_helper import clean_html
+from utils.url_helper import (
+    clean_html, collect_elements, is_internal_url, normalize_url,
+    PHONE_NOISE_PATTERN, TEXT_KEYWORD_PATTERN, SKIP_HREF_PREFIXES,
+)
 from database.db import SessionLocal
 from model.models import Firm, Website, Page, Link
 from utils.firm_manager import FirmManager
@@ -24,6 +28,7 @@ CONCURRENCY = 10
 TIMEOUT = 15
 RETRIES = 3
 BACKOFF = 0.5
+MAX_PAGE_BYTES = 2_000_000
 
 logger = logging.getLogger(__name__)
 
@@ -31,20 +36,21 @@ logger = logging.getLogger(__name__)
 EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
 PHONE_PATTERN = re.compile(r'(?:\+\d{1,3}[-.\s]?)?(?:\(?\d{1,4}\)?[-.\s]?)?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
 
+
 def extract_contact_info(text: str) -> dict:
     """Extract emails and phone numbers from text."""
-    emails = list(set(EMAIL_PATTERN.findall(text)))
+    emails = list(dict.fromkeys(EMAIL_PATTERN.findall(text)))  # dedupe, keeping page order
     phones = []
     
     # Find potential phone numbers
     potential_phones = PHONE_PATTERN.findall(text)
     for phone in potential_phones:
         # Clean and validate phone number (must have at least 7 digits)
-        cleaned = re.sub(r'[^0-9+]', '', phone)
+        cleaned = PHONE_NOISE_PATTERN.sub('', phone)
         if len(cleaned) >= 7:  # Minimum valid phone number length
             phones.append(phone.strip())
     
-    phones = list(set(phones))[:5]  # Limit to 5 unique phone numbers
+    phones = list(dict.fromkeys(phones))[:5]  # First 5 unique phone numbers, in page order
     
     return {
         "emails": emails[:10],  # Limit to 10 emails
@@ -55,38 +61,55 @@ def extract_contact_info(text: str) -> dict:
 # ========================================
 # FETCHING UTILITIES
 # ========================================
-async def fetch_page(client: httpx.AsyncClient, url: str, retries: int = RETRIES, backoff: float = BACKOFF) -> str:
-    """Fetch a single page asynchronously with retries."""
+async def fetch_page(client: httpx.AsyncClient, url: str, retries: int = RETRIES, backoff: float = BACKOFF):
+    """Fetch a single page asynchronously with retries.
+
+    Returns (raw body bytes, charset from the Content-Type header or None); the bytes go
+    straight to BeautifulSoup, which decodes them once with that charset (sniffing
+    <meta charset> only when the header names none), so no intermediate str is built.
+    """
     for attempt in range(1, retries + 1):
         try:
-            resp = await client.get(url, timeout=TIMEOUT, follow_redirects=True)
-            if resp.status_code == 200 and "text/html" in resp.headers.get("content-type", ""):
-                return resp.text
-            return ""
+            # Stream so non-HTML / oversized responses are rejected on headers alone
+            async with client.stream("GET", url, timeout=TIMEOUT, follow_redirects=True) as resp:
+                if resp.status_code != 200 or "text/html" not in resp.headers.get("content-type", ""):
+                    return b"", None
+                content_length = resp.headers.get("content-length", "")
+                if content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+                    logger.debug(f"[FETCH] skipping {url}: {content_length} bytes")
+                    return b"", None
+                return await resp.aread(), resp.charset_encoding
         except httpx.RequestError as e:
             logger.debug(f"[FETCH] attempt {attempt} failed for {url}: {e}")
             if attempt == retries:
                 logger.error(f"[ERROR] Fetch failed: {url} ({e})")
-                return ""
+                return b"", None
             await asyncio.sleep(backoff * (2 ** (attempt - 1)))
         except Exception as e:
             logger.exception(f"[ERROR] Unexpected fetch error for {url}: {e}")
-            return ""
-    return ""
+            return b"", None
+    return b"", None
 
 
 async def scrape_page(client, url, domain):
     """Fetch + parse a single page; return (page_text, links, meta info)."""
-    html = await fetch_page(client, url)
+    html, encoding = await fetch_page(client, url)
     if not html:
         return "", [], {}
 
-    soup = clean_html(html)
+    # Parsing is pure CPU work - run it off the event loop so other workers keep fetching
+    return await asyncio.to_thread(parse_page, html, url, domain, encoding)
+
+
+def parse_page(html: bytes, url: str, domain: str, encoding: Optional[str] = None):
+    """Parse fetched HTML (no I/O); return (page_text, links, meta info)."""
+    soup = clean_html(html, from_encoding=encoding)
+
+    # Single DOM walk shared by the text and link extraction passes below
+    footer_elements, contact_elements, text_elements, anchors = collect_elements(soup)
 
     # PRIORITY 1: Extract FOOTER content (usually contains hours, contact, address)
     footer_texts = []
-    footer_elements = soup.find_all(['footer', 'div'], class_=lambda c: c and any(x in str(c).lower() for x in ['footer', 'contact', 'hours', 'info']))
-    footer_elements += soup.find_all(['footer', 'div'], id=lambda i: i and any(x in str(i).lower() for x in ['footer', 'contact', 'hours', 'info']))
     
     for footer in footer_elements:
         footer_text = footer.get_text(" ", strip=True)
@@ -94,31 +117,18 @@ async def scrape_page(client, url, domain):
             footer_texts.append(f"[FOOTER INFO] {footer_text}")
     
     # PRIORITY 2: Extract specific contact/hours elements
-    contact_selectors = [
-        ('time', {}),
-        ('address', {}),
-        ('[itemprop="openingHours"]', {}),
-        ('[itemprop="telephone"]', {}),
-        ('[itemprop="address"]', {}),
-        ('div', {'class': lambda c: c and any(x in str(c).lower() for x in ['hours', 'schedule', 'open'])}),
-        ('span', {'class': lambda c: c and any(x in str(c).lower() for x in ['phone', 'tel', 'hours'])}),
-    ]
-    
     contact_texts = []
-    for selector, attrs in contact_selectors:
-        elements = soup.find_all(selector, attrs) if attrs else soup.select(selector)
-        for elem in elements:
-            text = elem.get_text(" ", strip=True)
-            if text and len(text) > 2:
-                contact_texts.append(f"[CONTACT] {text}")
+    for elem in contact_elements:
+        text = elem.get_text(" ", strip=True)
+        if text and len(text) > 2:
+            contact_texts.append(f"[CONTACT] {text}")
     
     # PRIORITY 3: Extract text from ALL relevant elements
-    text_elements = soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "div", "span", "article", "section", "td", "th", "time", "address", "label"])
     texts = []
     for e in text_elements:
         text = e.get_text(" ", strip=True)
         # Keep meaningful text and contact/time keywords
-        if text and (len(text) > 3 or any(keyword in text.lower() for keyword in ['am', 'pm', 'hours', 'phone', 'email', '@'])):
+        if text and (len(text) > 3 or TEXT_KEYWORD_PATTERN.search(text)):
             texts.append(text)
     
     # Combine: Footer first (highest priority), then contact info, then general content
@@ -135,21 +145,36 @@ async def scrape_page(client, url, domain):
     phone_info = phone_meta["content"].strip() if phone_meta and phone_meta.get("content") else ""
     
     # Extract schema.org JSON-LD
-    schema_text = ""
+    schema_parts = []
     for script in soup.find_all("script", type="application/ld+json"):
         try:
             import json
             data = json.loads(script.string)
-            schema_text += " " + str(data)
+            schema_parts.append(str(data))
         except:
             pass
+    schema_text = " " + " ".join(schema_parts) if schema_parts else ""
 
     # Extract internal links
+    # Absolute and root-relative hrefs skip urljoin; only other relative forms need it
     links = []
-    for a in soup.find_all("a", href=True):
-        href = urljoin(url, a["href"])
-        parsed = urlparse(href)
-        if parsed.netloc == domain:
+    page = urlparse(url)
+    page_root = f"{page.scheme}://{page.netloc}"
+    page_is_internal = page.netloc == domain
+    for a in anchors:
+        raw = a["href"]
+        if raw.startswith(SKIP_HREF_PREFIXES):
+            continue
+        if raw.startswith(("https://", "http://")):
+            href = raw
+            internal = is_internal_url(href, domain)
+        elif raw.startswith("/") and not raw.startswith("//"):
+            href = page_root + raw
+            internal = page_is_internal
+        else:
+            href = urljoin(url, raw)
+            internal = is_internal_url(href, domain)
+        if internal:
             title_txt = a.get_text(strip=True) or "link"
             links.append({"title": title_txt, "url": href})
 
@@ -157,16 +182,20 @@ async def scrape_page(client, url, domain):
     contact_data = extract_contact_info(page_text)
     
     # Add extracted contact info prominently to page text
+    # (collect the fragments and join once instead of repeated str +=)
+    suffix = []
     if contact_data["emails"]:
-        page_text += " [EMAILS: " + ", ".join(contact_data["emails"]) + "]"
+        suffix.append(f"[EMAILS: {', '.join(contact_data['emails'])}]")
     if contact_data["phones"]:
-        page_text += " [PHONES: " + ", ".join(contact_data["phones"]) + "]"
+        suffix.append(f"[PHONES: {', '.join(contact_data['phones'])}]")
     
     # Append schema and phone data to page text for better search
     if phone_info:
-        page_text += f" [META_PHONE: {phone_info}]"
+        suffix.append(f"[META_PHONE: {phone_info}]")
     if schema_text:
-        page_text += " [SCHEMA: " + schema_text + "]"
+        suffix.append(f"[SCHEMA: {schema_text}]")
+    if suffix:
+        page_text = " ".join((page_text, *suffix))
     
     meta_info = {
         "title": title, 
@@ -181,12 +210,16 @@ async def scrape_page(client, url, domain):
 # ========================================
 # CLEAN DOMAIN
 # ========================================
+# scheme and "www." are optional; capture the first host label
+FIRM_NAME_PATTERN = re.compile(r'^(?:https?://)?(?:www\.)?([^./]+)')
+
+
 def clean_domain(url: str) -> str:
     """Clean up domain for naming consistency."""
     if not url:
         return ""
-    clean_url = url.replace("https://", "").replace("http://", "").replace("www.", "").rstrip("/")
-    return clean_url.split(".")[0]
+    match = FIRM_NAME_PATTERN.match(url)
+    return match.group(1) if match else ""
 
 
 # ========================================
@@ -217,9 +250,10 @@ async def build_about(url: str, base_dir="scraped_data"):
                     break
 
                 try:
-                    if current in visited:
+                    current_key = normalize_url(current)
+                    if current_key in visited:
                         continue
-                    visited.add(current)
+                    visited.add(current_key)
 
                     page_text, links, meta_info = await scrape_page(client, current, domain)
                     if page_text:
@@ -230,15 +264,14 @@ async def build_about(url: str, base_dir="scraped_data"):
                         }
 
                     for link in links:
-                        if link["url"] not in seen_links:
-                            seen_links.add(link["url"])
-                            all_links.append(link)
-                        parsed = urlparse(link["url"])
-                        if (
-                            parsed.netloc == domain
-                            and link["url"] not in visited
-                            and len(visited) < MAX_PAGES
-                        ):
+                        # Dedup on the canonical URL but fetch the original (avoids redirects)
+                        key = normalize_url(link["url"])
+                        if key in seen_links:
+                            continue
+                        seen_links.add(key)
+                        all_links.append(link)
+                        # scrape_page only returns same-domain links, no need to re-parse here
+                        if key not in visited and len(visited) < MAX_PAGES:
                             await q.put(link["url"])
 
                 except Exception as e:
@@ -276,13 +309,14 @@ async def build_about(url: str, base_dir="scraped_data"):
         "tagline": first_data.get("title", ""),
         "meta_description": first_data.get("meta_description", ""),
         "short_description": first_data.get("text", "")[:300],
-        "full_text": " ".join([p["text"] for p in all_texts_by_url.values()]),
+        "full_text": " ".join(p["text"] for p in all_texts_by_url.values()),
     }
 
     # ========================================
     # SAVE TO DATABASE
     # ========================================
-    firm_id = save_to_db(about_data, all_links, all_texts_by_url)
+    # Run the blocking DB writes off the event loop so other crawls keep fetching
+    firm_id = await asyncio.to_thread(save_to_db, about_data, all_links, all_texts_by_url)
     about_data["firm_id"] = firm_id
     return about_data
 
@@ -290,6 +324,18 @@ async def build_about(url: str, base_dir="scraped_data"):
 # ========================================
 # DATABASE STORAGE
 # ========================================
+EXISTS_BATCH = 500  # keep IN (...) lists under SQLite's bound-parameter limit
+
+
+def _existing_urls(db, column, urls) -> set:
+    """Return the subset of `urls` already stored in `column`, one query per batch."""
+    existing = set()
+    for i in range(0, len(urls), EXISTS_BATCH):
+        batch = urls[i:i + EXISTS_BATCH]
+        existing.update(u for (u,) in db.query(column).filter(column.in_(batch)))
+    return existing
+
+
 def save_to_db(about_obj, all_links, all_texts_by_url):
     """Store firm + website + page + link data."""
     db = SessionLocal()
@@ -312,26 +358,30 @@ def save_to_db(about_obj, all_links, all_texts_by_url):
             db.refresh(website)
 
         # === Pages ===
-        for page_url, content_data in all_texts_by_url.items():
-            if not db.query(Page).filter_by(url=page_url).first():
-                page = Page(
-                    url=page_url,
-                    title=content_data.get("title"),
-                    meta_description=content_data.get("meta_description"),
-                    content=content_data.get("text"),
-                    website_id=website.id
-                )
-                db.add(page)
+        existing_pages = _existing_urls(db, Page.url, list(all_texts_by_url))
+        db.add_all([
+            Page(
+                url=page_url,
+                title=content_data.get("title"),
+                meta_description=content_data.get("meta_description"),
+                content=content_data.get("text"),
+                website_id=website.id
+            )
+            for page_url, content_data in all_texts_by_url.items()
+            if page_url not in existing_pages
+        ])
 
         # === Links ===
-        for link in all_links:
-            if not db.query(Link).filter_by(url=link["url"]).first():
-                new_link = Link(
-                    title=link.get("title", "link"),
-                    url=link["url"],
-                    website_id=website.id
-                )
-                db.add(new_link)
+        existing_links = _existing_urls(db, Link.url, [link["url"] for link in all_links])
+        db.add_all([
+            Link(
+                title=link.get("title", "link"),
+                url=link["url"],
+                website_id=website.id
+            )
+            for link in all_links
+            if link["url"] not in existing_links
+        ])
 
         db.commit()
         
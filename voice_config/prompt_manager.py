@@ -1,9 +1,6 @@
 from langchain.prompts import PromptTemplate
 
-def voice_rag_prompt(schema_summary: str = ""):
-    return PromptTemplate(
-        input_variables=["input", "agent_scratchpad"],
-        template="""You are a knowledgeable voice assistant helping users find information about law firms. Provide complete, detailed answers in a natural, conversational way.
+VOICE_RAG_TEMPLATE = """You are a knowledgeable voice assistant helping users find information about law firms. Provide complete, detailed answers in a natural, conversational way.
 
 Your goal is to search the available data and provide comprehensive, helpful responses about law firms, their services, specializations, and practice areas.
 
@@ -38,4 +35,15 @@ Question: {input}
 
 {agent_scratchpad}
 
-Answer (detailed & natural):""")
+Answer (detailed & natural):"""
+
+
+# The template has no schema_summary placeholder, so a single instance is built
+# (and validated) once at import and shared by every caller
+VOICE_RAG_PROMPT = PromptTemplate(
+    input_variables=["input", "agent_scratchpad"],
+    template=VOICE_RAG_TEMPLATE)
+
+
+def voice_rag_prompt(schema_summary: str = ""):
+    return VOICE_RAG_PROMPT
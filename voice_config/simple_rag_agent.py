@@ -3,13 +3,23 @@ Simple Enhanced RAG Agent - Clean and minimal approach with proper prompt engine
 """
 
 import os
+import asyncio
 import json
 import time
 import logging
 import re
-from typing import List, Dict, Any
-from utils.vector_store import FAISSVectorStore
-from openai import OpenAI
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import numpy as np
+import faiss
+from utils.vector_store import vector_store as shared_vector_store, embedding_model, EMBEDDING_DIM
+from utils.query_cache import QueryCache
+from utils.search_batcher import BatchingSearcher
+from utils.executors import run_in, available_cpus
+from utils.openai_clients import get_openai_client, get_async_openai_client
+from utils.llm_tools import join_within_limit
 from dotenv import load_dotenv
 
 # Load environment
@@ -18,161 +28,466 @@ load_dotenv(override=True)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# URLs, emails, HTML tags, [markers] and (…http…) asides stripped from retrieved chunks
+CONTENT_NOISE_PATTERN = re.compile(
+    r'https?://\S+'
+    r'|www\.\S+'
+    r'|\S+@\S+\.\S+'
+    r'|<[^>]+>'
+    r'|\[[^\]]+\]'
+    r'|\([^)]*http[^)]*\)'
+)
+
+# Sentence boundary used to hand streamed LLM text to TTS one sentence at a time: end
+# punctuation, whitespace, then the capitalised (or numeric / quoted) start of the next sentence
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+(?=["\'(]?[A-Z0-9])')
+# Periods that don't end a sentence in firm answers ("Dr. Smith", "St. Louis", "Smith & Co. LLP")
+NON_TERMINAL_ABBREVIATIONS = frozenset({
+    "dr", "mr", "mrs", "ms", "jr", "sr", "st", "mt", "ft", "no", "vs", "etc",
+    "inc", "co", "corp", "ltd", "ave", "blvd", "rd", "ste", "dept", "atty", "esq", "hon",
+})
+# Initials and dotted abbreviations: "J.", "P.C.", "U.S.", "e.g.", "i.e."
+INITIALISM_PATTERN = re.compile(r'(?:[A-Za-z]\.)+$')
+
+def split_sentences(text: str) -> Tuple[List[str], str]:
+    """Split the complete sentences off the front of `text`; returns (sentences, unfinished rest)"""
+    sentences, start = [], 0
+    for match in SENTENCE_END_PATTERN.finditer(text):
+        candidate = text[start:match.start()]
+        last_word = candidate.rsplit(None, 1)[-1].lstrip('"\'(')
+        if last_word.endswith('.') and (
+            last_word[:-1].lower() in NON_TERMINAL_ABBREVIATIONS or INITIALISM_PATTERN.fullmatch(last_word)
+        ):
+            continue  # abbreviation, not a sentence end - keep it with the next words
+        sentences.append(candidate)
+        start = match.end()
+    return sentences, text[start:]
+
+# Keyword expansion: trigger substring -> group, and each group's expansions in priority order
+KEYWORD_GROUPS = {
+    'law': 'legal', 'legal': 'legal',
+    'service': 'service', 'help': 'service',
+    'about': 'about', 'who': 'about',
+    'contact': 'contact',
+}
+KEYWORD_EXPANSIONS = (
+    ('legal', ('legal services', 'attorneys', 'law firm')),
+    ('service', ('services', 'practice areas')),
+    ('about', ('about us', 'company')),
+    ('contact', ('contact', 'email', 'phone', 'address')),
+)
+# Lookahead so overlapping triggers are all seen, matching the old per-keyword `in` checks
+KEYWORD_TRIGGER_PATTERN = re.compile(r'(?=(law|legal|service|help|about|who|contact))', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def keyword_vector(keyword: str) -> np.ndarray:
+    """Expansion keywords come from a fixed table, so each is embedded once per process"""
+    return np.asarray(embedding_model.encode([keyword]), dtype="float32")
+
+# Upper bound on the LLM context for a voice answer (3 cleaned hits normally fit well inside it)
+MAX_VOICE_CONTEXT_CHARS = 3000
+
+# Seconds a cached answer is served before it is regenerated from the (possibly updated) store
+ANSWER_CACHE_TTL = 600
+
+# Voice answer prompt - the static instructions go in a byte-identical system message so the
+# request prefix is the same on every turn; only the user message carries query/context
+VOICE_ANSWER_SYSTEM_PROMPT = """You are a helpful voice assistant. Based on the provided context, answer the user's question in a natural, conversational way suitable for voice output.
+
+IMPORTANT GUIDELINES:
+- Provide a direct, helpful answer
+- Use natural, conversational language 
+- Keep response concise but informative (under 200 words)
+- DO NOT mention URLs, website links, or technical details
+- DO NOT say "according to the context" or "based on the provided information"
+- Speak as if you naturally know this information
+- If the context doesn't fully answer the question, provide what information is available"""
+
+VOICE_ANSWER_USER_PROMPT = """User Question: {query}
+
+Context Information:
+{context}
+
+Voice Response:"""
+
+# CPU-bound agent work (query embedding, FAISS search) runs on its own pool sized to the CPUs
+# the container may use, so voice turns don't queue behind scraper parsing / embedding jobs
+RAG_EXECUTOR = ThreadPoolExecutor(max_workers=available_cpus(), thread_name_prefix="rag")
+# Blocking sync LLM calls (30 s timeout + retries) wait on the network: they get their own pool
+# so a few slow OpenAI responses can't hold the CPU pool every session's search goes through
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+def normalize_query(query: Optional[str]) -> str:
+    """Collapse whitespace in a (voice-transcribed) query; casing is kept for the cased embedding model"""
+    return " ".join(query.split()) if query else ""
+
+class SemanticResponseCache:
+    """Reuse answers for near-duplicate queries (cosine similarity of query embeddings).
+
+    Entries live in an in-memory FAISS inner-product index and expire `ttl_seconds`
+    after insertion; once `max_entries` is reached the least-recently-used 10% are
+    dropped. Guarded by a lock because the agent is called from worker threads (run_in).
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 5000, ttl_seconds: float = 600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        self.answers: List[str] = []
+        self.last_used: List[float] = []
+        self.inserted_at: List[float] = []  # time.monotonic() at add
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def embed(query: str) -> np.ndarray:
+        """Normalized (1, dim) float32 embedding for `query`."""
+        vec = np.asarray(embedding_model.encode([query]), dtype="float32")
+        faiss.normalize_L2(vec)
+        return vec
+
+    def lookup(self, vec: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Return (answer, expires_at) for the closest live query if it clears the threshold."""
+        with self._lock:
+            if self.index.ntotal == 0:
+                return None
+            scores, ids = self.index.search(vec, 1)
+            idx = int(ids[0][0])
+            if idx < 0 or scores[0][0] < self.threshold:
+                return None
+            expires_at = self.inserted_at[idx] + self.ttl_seconds
+            if expires_at < time.monotonic():
+                # An expired entry would keep shadowing a fresh re-add of the same query
+                self._drop_expired()
+                return None
+            self.last_used[idx] = time.time()
+            return self.answers[idx], expires_at
+
+    def add(self, vec: np.ndarray, answer: str):
+        with self._lock:
+            if self.index.ntotal >= self.max_entries:
+                self._evict()
+            self.index.add(vec)
+            self.answers.append(answer)
+            self.last_used.append(time.time())
+            self.inserted_at.append(time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._keep([])
+
+    def _evict(self):
+        """Drop the least-recently-used 10% of entries."""
+        total = self.index.ntotal
+        by_age = sorted(range(total), key=self.last_used.__getitem__)
+        self._keep(sorted(by_age[max(1, total // 10):]))
+
+    def _drop_expired(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        self._keep([i for i, t in enumerate(self.inserted_at) if t >= cutoff])
+
+    def _keep(self, keep: List[int]):
+        """Rebuild the index with only the entries at positions `keep` (ascending)."""
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)[keep] if keep else None
+        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        if keep:
+            self.index.add(vectors)
+        self.answers = [self.answers[i] for i in keep]
+        self.last_used = [self.last_used[i] for i in keep]
+        self.inserted_at = [self.inserted_at[i] for i in keep]
+
+
 class EnhancedRAGAgent:
     """Simple enhanced RAG agent with better search and proper response formatting"""
     
     def __init__(self):
+        # Two tiers: exact (normalized text) first, then semantic (embedding similarity); both
+        # expire after ANSWER_CACHE_TTL and are cleared whenever the vector store's content changes
+        self.exact_cache = QueryCache(max_size=2000, ttl_seconds=ANSWER_CACHE_TTL)
+        self.response_cache = SemanticResponseCache(ttl_seconds=ANSWER_CACHE_TTL)
+        self._cache_version = None
         try:
-            self.vector_store = FAISSVectorStore()
+            # Share the process-wide store (index + encoder are loaded once at import)
+            self.vector_store = shared_vector_store
+            # Concurrent voice sessions share FAISS calls through one micro-batcher
+            self.search_batcher = BatchingSearcher(self.vector_store.search_vectors, executor=RAG_EXECUTOR)
             total_docs = len(self.vector_store.documents) if self.vector_store.documents else 0
-            logger.info(f"RAG Agent ready - {total_docs} documents available")
+            logger.info("RAG Agent ready - %s documents available", total_docs)
             
             # Initialize OpenAI client for proper response generation
             openai_key = os.getenv("OPENAI_API_KEY")
             if openai_key:
-                self.client = OpenAI(api_key=openai_key)
+                # Process-wide clients: one connection pool shared by every agent/session
+                self.client = get_openai_client()
+                self.aclient = get_async_openai_client()
                 self.use_ai_formatting = True
             else:
                 self.client = None
+                self.aclient = None
                 self.use_ai_formatting = False
                 logger.warning("No OpenAI key found, using basic formatting")
                 
         except Exception as e:
-            logger.error(f"RAG Agent init error: {e}")
+            logger.error("RAG Agent init error: %s", e)
             self.vector_store = None
+            self.search_batcher = None
             self.client = None
+            self.aclient = None
     
     def search_and_respond(self, query: str) -> str:
         """Main search method with proper response formatting"""
         try:
+            # Normalize whitespace once: cache key, vector search and prompt all see the same string
+            query = normalize_query(query)
             if not self.vector_store or not query:
                 return "Sorry, I can't search right now. Please try again."
             
-            # Search with multiple approaches
-            results = self._smart_search(query)
+            # Same question as before: skip embedding, search and LLM entirely
+            version = self._sync_caches()
+            cache_key = query.lower()
+            cached = self.exact_cache.get(cache_key)
+            if cached:
+                return cached
+            
+            # Near-duplicate of an earlier question: skip search + LLM entirely
+            query_vec = self.response_cache.embed(query)
+            hit = self.response_cache.lookup(query_vec)
+            if hit:
+                logger.info("Semantic cache hit")
+                # Exact tier copy expires with the semantic entry, not TTL seconds from now
+                self.exact_cache.put(cache_key, hit[0], expires_at=hit[1])
+                return hit[0]
+            
+            # Search with multiple approaches (reusing the query embedding from the cache probe)
+            results = self._smart_search(query, query_vec)
             
             if not results:
                 return f"I don't have information about '{query}'. Try asking about legal services, law firms, or contact details."
             
             # Advanced response formatting with AI
             if self.use_ai_formatting:
-                return self._generate_ai_response(query, results)
+                response, answered = self._generate_ai_response(query, results)
             else:
-                return self._format_basic_response(query, results)
+                response, answered = self._format_basic_response(query, results), True
+            
+            # Fallback/apology text from a failed LLM call is served once, never cached
+            if answered:
+                self._cache_answer(version, cache_key, query_vec, response)
+            return response
             
         except Exception as e:
-            logger.error(f"Search error: {e}")
+            logger.error("Search error: %s", e)
             return "I encountered an error. Please try rephrasing your question."
     
-    def _smart_search(self, query: str) -> List[Dict[str, Any]]:
-        """Enhanced search with keyword expansion"""
-        all_results = []
+    async def astream_response(self, query: str) -> AsyncIterator[str]:
+        """Async search_and_respond: yields the answer sentence by sentence as the LLM streams it"""
+        query = normalize_query(query)
+        if not self.vector_store or not query or not self.aclient:
+            yield await run_in(LLM_EXECUTOR, self.search_and_respond, query)
+            return
+        
+        version = self._sync_caches()
+        cache_key = query.lower()
+        cached = self.exact_cache.get(cache_key)
+        if cached:
+            yield cached
+            return
+        
+        try:
+            # Embedding and cache probe are blocking CPU work - one hop off the event loop
+            query_vec, hit, search_matrix = await run_in(RAG_EXECUTOR, self._retrieve, query)
+            if not hit:
+                # FAISS search goes through the batcher so concurrent sessions share one call
+                rows = await self.search_batcher.search(search_matrix, n_results=10)
+                results = self._select_results(rows)
+        except Exception as e:
+            logger.error("Search error: %s", e)
+            yield "I encountered an error. Please try rephrasing your question."
+            return
+        
+        if hit:
+            logger.info("Semantic cache hit")
+            self.exact_cache.put(cache_key, hit[0], expires_at=hit[1])
+            yield hit[0]
+            return
         
-        # Direct search
-        results1 = self.vector_store.search(query=query, n_results=10)
-        all_results.extend(results1)
+        if not results:
+            yield f"I don't have information about '{query}'. Try asking about legal services, law firms, or contact details."
+            return
         
-        # Keyword expansion
-        keywords = self._get_keywords(query)
-        for keyword in keywords[:2]:  # Only top 2
-            results2 = self.vector_store.search(query=keyword, n_results=5)
-            all_results.extend(results2)
+        sentences = []
+        outcome = {"complete": False}
+        async for sentence in self._stream_ai_response(query, results, outcome):
+            sentences.append(sentence)
+            yield sentence
+        # A stream cut off mid-answer was still spoken, but must not be replayed as the full answer
+        if sentences and outcome["complete"]:
+            self._cache_answer(version, cache_key, query_vec, " ".join(sentences))
+    
+    def _sync_caches(self) -> int:
+        """Drop both answer tiers if the vector store changed since they were filled; returns its version"""
+        version = self.vector_store.version
+        if version != self._cache_version:
+            self.exact_cache.clear()
+            self.response_cache.clear()
+            self._cache_version = version
+        return version
+    
+    def _cache_answer(self, version: int, cache_key: str, query_vec: np.ndarray, response: str):
+        """Cache an answer unless documents were added/removed while it was being generated"""
+        if self.vector_store.version != version:
+            return
+        self.response_cache.add(query_vec, response)
+        self.exact_cache.put(cache_key, response)
+    
+    def _retrieve(self, query: str) -> Tuple[np.ndarray, Optional[Tuple[str, float]], Optional[np.ndarray]]:
+        """Embed the query and probe the semantic cache; on a miss also build the search matrix"""
+        query_vec = self.response_cache.embed(query)
+        hit = self.response_cache.lookup(query_vec)
+        if hit:
+            return query_vec, hit, None
+        return query_vec, None, self._search_matrix(query, query_vec)
+    
+    def _search_matrix(self, query: str, query_vec: np.ndarray) -> np.ndarray:
+        """Query embedding stacked with the top 2 keyword expansions (memoized, no encoder pass)"""
+        keywords = self._get_keywords(query)[:2]
+        return np.vstack([query_vec] + [keyword_vector(kw) for kw in keywords])
+    
+    def _smart_search(self, query: str, query_vec: Optional[np.ndarray] = None,
+                      need: int = 3, min_clean_len: int = 30) -> List[Dict[str, Any]]:
+        """Enhanced search with keyword expansion; returns up to `need` deduped hits carrying 'clean_text'"""
+        # Direct search + top 2 keyword expansions in one batched FAISS search
+        if query_vec is None:
+            rows = self.vector_store.search_batch([query] + self._get_keywords(query)[:2], n_results=10)
+        else:
+            # Query already embedded for the cache probe: no encoder pass here
+            rows = self.vector_store.search_vectors(self._search_matrix(query, query_vec), n_results=10)
+        return self._select_results(rows, need, min_clean_len)
+    
+    def _select_results(self, rows: List[List[Dict[str, Any]]],
+                        need: int = 3, min_clean_len: int = 30) -> List[Dict[str, Any]]:
+        """Merge direct (first row) and keyword-expansion hits into up to `need` clean, deduped results"""
+        all_results = list(rows[0])
+        for keyword_results in rows[1:]:
+            all_results.extend(keyword_results[:5])  # hits are score-ordered, same as n_results=5
         
-        # Remove duplicates and filter
-        unique_results = []
+        # One best-first pass: filter, dedupe and clean, stopping once `need` usable hits are found
+        all_results.sort(key=lambda x: x.get('score', 0), reverse=True)
+        good_results = []
         seen_texts = set()
         
         for result in all_results:
-            text = result.get('text', '')[:100]  # First 100 chars for comparison
-            if text not in seen_texts and result.get('score', 0) > 0.2:
-                seen_texts.add(text)
-                unique_results.append(result)
+            if result.get('score', 0) <= 0.2:
+                break  # sorted, so every remaining hit is below the threshold too
+            text = result.get('text', '')
+            key = text[:100]  # First 100 chars for comparison
+            if key in seen_texts:
+                continue
+            seen_texts.add(key)
+            
+            cleaned = self._clean_content(text)
+            if len(cleaned) <= min_clean_len:
+                continue
+            result['clean_text'] = cleaned
+            good_results.append(result)
+            if len(good_results) == need:
+                break
         
-        # Sort by score
-        unique_results.sort(key=lambda x: x.get('score', 0), reverse=True)
-        return unique_results[:5]  # Top 5 results
+        return good_results
     
     def _get_keywords(self, query: str) -> List[str]:
-        """Simple keyword expansion"""
-        keywords = []
-        q = query.lower()
-        
-        if 'law' in q or 'legal' in q:
-            keywords.extend(['legal services', 'attorneys', 'law firm'])
-        if 'service' in q or 'help' in q:
-            keywords.extend(['services', 'practice areas'])
-        if 'about' in q or 'who' in q:
-            keywords.extend(['about us', 'company'])
-        if 'contact' in q:
-            keywords.extend(['contact', 'email','phone', 'address'])
-            
-        return keywords
+        """Simple keyword expansion (one regex pass over the query)"""
+        hits = {KEYWORD_GROUPS[m.group(1).lower()] for m in KEYWORD_TRIGGER_PATTERN.finditer(query)}
+        if not hits:
+            return []
+        return [kw for group, expansions in KEYWORD_EXPANSIONS if group in hits for kw in expansions]
+    
+    def _build_context(self, results: List[Dict[str, Any]]) -> str:
+        """Join the top results (already cleaned by _smart_search) into the LLM context, capped in one pass"""
+        return join_within_limit([r['clean_text'] for r in results[:3]], MAX_VOICE_CONTEXT_CHARS, sep="\n\n")
+    
+    def _build_messages(self, query: str, context: str) -> List[Dict[str, str]]:
+        """Create the chat messages for a voice response (static system prompt + per-turn user message)"""
+        return [
+            {"role": "system", "content": VOICE_ANSWER_SYSTEM_PROMPT},
+            {"role": "user", "content": VOICE_ANSWER_USER_PROMPT.format(query=query, context=context)},
+        ]
     
-    def _generate_ai_response(self, query: str, results: List[Dict[str, Any]]) -> str:
-        """Generate proper AI response using OpenAI"""
+    def _generate_ai_response(self, query: str, results: List[Dict[str, Any]]) -> Tuple[str, bool]:
+        """Generate proper AI response using OpenAI; returns (text, True if the LLM produced it)"""
         try:
-            # Clean and prepare context from search results
-            context_parts = []
-            for result in results[:3]:  # Top 3 results
-                text = self._clean_content(result.get('text', ''))
-                if text and len(text.strip()) > 30:
-                    context_parts.append(text)
+            context = self._build_context(results)
+            if not context:
+                return "I found some information but couldn't process it properly. Please try rephrasing your question.", False
             
-            if not context_parts:
-                return "I found some information but couldn't process it properly. Please try rephrasing your question."
-            
-            context = "\n\n".join(context_parts)
-            
-            # Create proper prompt for voice response
-            prompt = f"""You are a helpful voice assistant. Based on the provided context, answer the user's question in a natural, conversational way suitable for voice output.
-
-IMPORTANT GUIDELINES:
-- Provide a direct, helpful answer
-- Use natural, conversational language 
-- Keep response concise but informative (under 200 words)
-- DO NOT mention URLs, website links, or technical details
-- DO NOT say "according to the context" or "based on the provided information"
-- Speak as if you naturally know this information
-- If the context doesn't fully answer the question, provide what information is available
-
-User Question: {query}
-
-Context Information:
-{context}
-
-Voice Response:"""
-
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+                messages=self._build_messages(query, context),
                 max_tokens=200,
                 temperature=0
             )
             
-            return response.choices[0].message.content.strip()
+            return response.choices[0].message.content.strip(), True
             
         except Exception as e:
-            logger.error(f"AI response generation error: {e}")
-            return self._format_basic_response(query, results)
+            logger.error("AI response generation error: %s", e)
+            return self._format_basic_response(query, results), False
+    
+    async def _stream_ai_response(self, query: str, results: List[Dict[str, Any]],
+                                  outcome: Optional[Dict[str, bool]] = None) -> AsyncIterator[str]:
+        """Stream the AI response, yielding each sentence as soon as it is complete.
+
+        `outcome["complete"]` is set once a whole LLM answer has been yielded; it stays False
+        when the stream fails after some sentences were already sent, or when only an
+        apology/basic-formatting fallback could be given.
+        """
+        if outcome is None:
+            outcome = {}
+        sent_any = False
+        try:
+            context = self._build_context(results)
+            if not context:
+                yield "I found some information but couldn't process it properly. Please try rephrasing your question."
+                return
+            
+            stream = await self.aclient.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=self._build_messages(query, context),
+                max_tokens=200,
+                temperature=0,
+                stream=True
+            )
+            
+            buffer = ""
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                buffer += chunk.choices[0].delta.content or ""
+                sentences, buffer = split_sentences(buffer)
+                for sentence in sentences:
+                    if sentence.strip():
+                        sent_any = True
+                        yield sentence.strip()
+            if buffer.strip():
+                sent_any = True
+                yield buffer.strip()
+            outcome["complete"] = True
+                
+        except Exception as e:
+            logger.error("AI response streaming error: %s", e)
+            if not sent_any:
+                # Retry once without streaming (it degrades to basic formatting on failure)
+                response, answered = await run_in(LLM_EXECUTOR, self._generate_ai_response, query, results)
+                yield response
+                outcome["complete"] = answered
     
     def _clean_content(self, text: str) -> str:
         """Clean content by removing URLs and unwanted elements"""
         if not text:
             return ""
         
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-        text = re.sub(r'www\.\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+\.\S+', '', text)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove technical markers and brackets
-        text = re.sub(r'\[[^\]]+\]', '', text)
-        text = re.sub(r'\([^)]*http[^)]*\)', '', text)  # Remove parentheses with URLs
+        # URLs, emails, HTML tags and technical markers in a single pass
+        text = CONTENT_NOISE_PATTERN.sub('', text)
         
         # Clean up extra whitespace
         text = ' '.join(text.split())
@@ -187,7 +502,7 @@ Voice Response:"""
         """Basic response formatting fallback"""
         texts = []
         for result in results[:2]:  # Top 2 results
-            text = self._clean_content(result.get('text', ''))
+            text = result.get('clean_text') or self._clean_content(result.get('text', ''))
             if text:
                 texts.append(text[:300])  # Limit length
         
@@ -214,11 +529,25 @@ Voice Response:"""
         return {
             "documents": total_docs,
             "vectors": total_vectors,
-            "status": "active" if total_docs > 0 else "empty"
+            "status": "active" if total_docs > 0 else "empty",
+            "query_cache": self.exact_cache.stats(),
+            "search_batcher": self.search_batcher.stats()
         }
 
+# Process-wide agent: one set of answer caches and one search batcher for every caller
+_rag_agent: Optional[EnhancedRAGAgent] = None
+_rag_agent_lock = threading.Lock()
+
+def get_rag_agent() -> EnhancedRAGAgent:
+    """Shared EnhancedRAGAgent, created on first use"""
+    global _rag_agent
+    if _rag_agent is None:
+        with _rag_agent_lock:
+            if _rag_agent is None:
+                _rag_agent = EnhancedRAGAgent()
+    return _rag_agent
+
 # Simple utility functions
 def quick_search(query: str) -> str:
-    """Quick search utility function"""
-    agent = EnhancedRAGAgent()
-    return agent.search_and_respond(query)
\ No newline at end of file
+    """Quick search utility function (uses the shared agent, and with it its caches)"""
+    return get_rag_agent().search_and_respond(query)
@@ -2,30 +2,118 @@ import asyncio
 import io
 import os
 import re
-import json
+import orjson
 import base64
+import binascii
+import logging
 import time
-from fastapi import WebSocket
-from typing import List, Dict, Any
+from fastapi import WebSocket, WebSocketDisconnect
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
+from operator import itemgetter
 from dotenv import load_dotenv
-from openai import OpenAI
-from voice_config.simple_rag_agent import EnhancedRAGAgent
-from openai import AsyncOpenAI
+from voice_config.simple_rag_agent import get_rag_agent, RAG_EXECUTOR, LLM_EXECUTOR
+from utils.executors import run_in
+from utils.openai_clients import get_async_openai_client
 
 load_dotenv(override=True)
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+
+async def warm_openai_pool():
+    """Open a pooled connection to OpenAI ahead of the first voice turn."""
+    try:
+        await get_async_openai_client().models.list()
+        print("✅ OpenAI voice connection pool warmed")
+    except Exception as e:
+        print(f"⚠️ OpenAI pool warmup failed: {e}")
+
+
+async def send_frame(ws: WebSocket, payload: Dict[str, Any]):
+    """ws.send_json via orjson (text/control frames; TTS audio goes out as binary frames)"""
+    await ws.send_text(orjson.dumps(payload).decode())
+
+
+# Largest utterance accepted from a client (the page caps recordings at 30 s, far below this)
+MAX_AUDIO_BYTES = 8 * 1024 * 1024
+MAX_AUDIO_B64_CHARS = (MAX_AUDIO_BYTES + 2) // 3 * 4
+
+
+async def receive_voice_message(ws: WebSocket) -> Dict[str, Any]:
+    """
+    Next client message as a dict. A binary frame is a recorded utterance, passed through as
+    raw bytes with no base64/JSON round-trip. Text frames are JSON (stop signal, or legacy
+    base64 "audio"). Either way recorded audio ends up under "audio_bytes"; oversized or
+    malformed audio is dropped (logged, returned as an empty message).
+    """
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        if len(message["bytes"]) > MAX_AUDIO_BYTES:
+            logger.warning("Dropping oversized audio frame (%d bytes)", len(message["bytes"]))
+            return {}
+        return {"audio_bytes": message["bytes"]}
+    data = orjson.loads(message["text"])
+    audio_b64 = data.pop("audio", None)
+    if audio_b64:
+        # Size check before decoding, so a huge payload is never expanded into a second buffer
+        if len(audio_b64) > MAX_AUDIO_B64_CHARS:
+            logger.warning("Dropping oversized base64 audio (%d chars)", len(audio_b64))
+            return data
+        try:
+            data["audio_bytes"] = base64.b64decode(audio_b64, validate=True)
+        except (binascii.Error, TypeError) as e:
+            logger.warning("Dropping malformed base64 audio: %s", e)
+    return data
+
+
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_KEY:
     raise RuntimeError("Please set OPENAI_API_KEY in .env")
 
+# Static prompt text, built once at import; only the per-turn fields are filled in
+VOICE_SYSTEM_MESSAGE = "You are a helpful, quick-witted AI assistant. Keep responses short and conversational for voice output."
+
+AGENTIC_ANSWER_PROMPT = """You are a helpful voice assistant. Use the provided context to answer the user's question naturally and conversationally.
+
+User Question: {query}
+
+Available Context:
+{context}
+
+Instructions:
+- Provide a natural, conversational response suitable for voice interaction
+- Use information from the context to answer comprehensively
+- If context is limited, acknowledge it but provide what you can
+- Keep the response between 2-4 sentences for voice clarity
+- Be helpful and informative
+- Don't mention technical terms like "database", "search results", or "context"
+
+Response:"""
+
+# Fixed fallback replies - like the greeting, their TTS audio is cached after first use
+KB_TROUBLE_REPLY = "I'm having trouble accessing my knowledge base right now. Could you try rephrasing your question or ask something else?"
+SEARCH_TIMEOUT_REPLY = "I'm taking longer than usual to search. Please try your question again, perhaps with different keywords."
+TECHNICAL_ERROR_REPLY = "I'm experiencing some technical difficulties. Please try your question again in a moment."
+CANNED_REPLIES = frozenset({KB_TROUBLE_REPLY, SEARCH_TIMEOUT_REPLY, TECHNICAL_ERROR_REPLY})
+
+# Keyword extraction for agentic search
+WORD_PATTERN = re.compile(r'\b\w+\b')
+KEYWORD_STOP_WORDS = frozenset({'the', 'is', 'are', 'what', 'how', 'can', 'do', 'you', 'tell', 'me', 'about', 'find', 'search'})
+
+# TTS audio is forwarded in 24 KB mp3 slices: only a few frames per sentence, the browser buffers playback
+TTS_CHUNK_SIZE = 24576
+
 class VoiceAssistant:
     def __init__(self):
         self.sessions = {}
-        self.client = OpenAI(api_key=OPENAI_KEY)
+        # Audio frames for fixed phrases (the greeting), so TTS runs once per process
+        self.tts_frame_cache: Dict[str, List[bytes]] = {}
         # Initialize Enhanced RAG Agent for advanced vector search
         try:
-            self.rag_agent = EnhancedRAGAgent()
+            # Shared with every other VoiceAssistant / quick_search caller in this process
+            self.rag_agent = get_rag_agent()
             print("[VoiceAssistant] Enhanced RAG Agent initialized successfully")
         except Exception as e:
             print(f"[VoiceAssistant] Warning: Could not initialize RAG Agent: {e}")
@@ -35,6 +123,11 @@ class VoiceAssistant:
     # WebSocket Handling
     # -------------------------
     SILENCE_TIMEOUT = 10  # seconds
+    MAX_SESSION_HISTORY = 20  # recent messages kept per session (plus the system message)
+
+    def end_session(self, session_id: str):
+        """Release a session's history once its websocket is gone"""
+        self.sessions.pop(session_id, None)
 
     async def handle_ws(self, ws: WebSocket):
         await ws.accept()
@@ -42,71 +135,67 @@ class VoiceAssistant:
         ws.session_id = session_id
         await ws.send_json({"info": "Session created", "session_id": session_id})
 
-        silence_task = asyncio.create_task(self.silence_watchdog(ws))
+        # Silence timeout as a re-armable timer handle - no new task per incoming message
+        loop = asyncio.get_running_loop()
+        silence_timer = loop.call_later(self.SILENCE_TIMEOUT, self.on_silence, ws)
 
         try:
             while True:
-                data = await ws.receive_text()
-                msg = json.loads(data)
+                msg = await receive_voice_message(ws)
 
                 # Stop connection
                 if msg.get("stop"):
-                    silence_task.cancel()
+                    silence_timer.cancel()
                     await ws.close()
                     break
 
                 # Handle audio
-                audio_b64 = msg.get("audio")
-                if audio_b64:
-                    audio_bytes = base64.b64decode(audio_b64)
-                    silence_task.cancel()
-                    silence_task = asyncio.create_task(self.silence_watchdog(ws))
+                audio_bytes = msg.get("audio_bytes")
+                if audio_bytes:
+                    silence_timer.cancel()
+                    silence_timer = loop.call_later(self.SILENCE_TIMEOUT, self.on_silence, ws)
                     await self.process_audio(ws, audio_bytes, ws.session_id)
 
         except Exception as e:
-            print(f"WebSocket error: {e}")
+            logger.error("WebSocket error: %s", e)
             await ws.close()
-            silence_task.cancel()
+            silence_timer.cancel()
+        finally:
+            self.end_session(session_id)
 
-    async def silence_watchdog(self, ws: WebSocket):
-        try:
-            await asyncio.sleep(self.SILENCE_TIMEOUT)
-            # Check if WebSocket is still connected before sending timeout message
-            if ws.client_state.name == "CONNECTED":
+    def on_silence(self, ws: WebSocket):
+        """Silence timer fired: end the session (the async send/close runs as a task)"""
+        ws.silence_task = asyncio.create_task(self.end_silent_session(ws))
+
+    async def end_silent_session(self, ws: WebSocket):
+        # Check if WebSocket is still connected before sending timeout message
+        if ws.client_state.name == "CONNECTED":
+            try:
+                await ws.send_json({"bot_text": "No input detected. Ending the session.", "audio": ""})
+                await ws.close()
+            except Exception as e:
+                logger.error("Error sending timeout message: %s", e)
+                # Try to close anyway
                 try:
-                    await ws.send_json({"bot_text": "No input detected. Ending the session.", "audio": ""})
                     await ws.close()
-                except Exception as e:
-                    print(f"Error sending timeout message: {e}")
-                    # Try to close anyway
-                    try:
-                        await ws.close()
-                    except:
-                        pass
-        except asyncio.CancelledError:
-            pass
+                except:
+                    pass
 
     # -------------------------
     # Audio -> Text -> Agent
     # -------------------------
     # --- PART 2: PROCESS LOGIC (STT + LLM) ---
     async def process_audio(self, ws: WebSocket, audio_bytes: bytes, session_id: str):
-        # Temp file for Whisper
-        filename = f"temp_{uuid.uuid4()}.wav"
-        with open(filename, "wb") as f:
-            f.write(audio_bytes)
-
         try:
-            # 1. Transcribe (Speech to Text)
-            with open(filename, "rb") as audio_file:
-                transcription = await client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio_file,
-                    language="en"
-                )
+            # 1. Transcribe (Speech to Text) - uploaded straight from memory, no temp file
+            transcription = await get_async_openai_client().audio.transcriptions.create(
+                model="whisper-1", 
+                file=("audio.wav", audio_bytes),
+                language="en"
+            )
             
             user_text = transcription.text.strip()
-            print(f"🗣️ User Said: {user_text}")
+            logger.debug("User said: %s", user_text)
 
             if not user_text:
                 return "continue"
@@ -114,71 +203,114 @@ class VoiceAssistant:
             # 2. Update Session History
             if session_id not in self.sessions:
                 self.sessions[session_id] = [
-                    {"role": "system", "content": "You are a helpful, quick-witted AI assistant. Keep responses short and conversational for voice output."}
+                    {"role": "system", "content": VOICE_SYSTEM_MESSAGE}
                 ]
             
-            self.sessions[session_id].append({"role": "user", "content": user_text})
+            history = self.sessions[session_id]
+            history.append({"role": "user", "content": user_text})
+            if len(history) > self.MAX_SESSION_HISTORY + 1:
+                del history[1:-self.MAX_SESSION_HISTORY]  # keep the system message + recent turns
 
-            # 3. Get RAG Agent Response (instead of direct GPT)
-            bot_reply = await self.ask_agent(session_id, user_text)
-
-            # 4. Call Streaming Sender
-            await self.safe_send(ws, bot_reply, user_text)
+            # 3 + 4. Stream the RAG answer into TTS sentence by sentence
+            await self.stream_reply(ws, session_id, user_text)
 
             return "continue"
 
         except Exception as e:
-            print(f"❌ Process Error: {e}")
+            logger.error("Process error: %s", e)
             return "error"
-        finally:
-            if os.path.exists(filename):
-                os.remove(filename)# -------------------------
+
+    # -------------------------
     # Agent Processing
     # -------------------------
+    async def stream_reply(self, ws: WebSocket, session_id: str, user_text: str):
+        """Speak the RAG answer sentence by sentence while the LLM is still generating the rest"""
+        if not self.rag_agent:
+            await self.safe_send(ws, await self.ask_agent(session_id, user_text), user_text)
+            return
+
+        logger.debug("Streaming Enhanced RAG answer for: %s", user_text)
+        start_time = time.time()
+        # Producer: TTS for each sentence starts as soon as the LLM finishes it, so the next
+        # sentence's audio is already downloading while the current one is being sent
+        pending: asyncio.Queue = asyncio.Queue()
+        tts_tasks: List[asyncio.Task] = []
+
+        async def produce():
+            try:
+                async for sentence in self.rag_agent.astream_response(user_text):
+                    audio, task = self._start_tts(sentence)
+                    tts_tasks.append(task)
+                    pending.put_nowait((sentence, audio))
+            except Exception as e:
+                logger.error("Enhanced RAG stream error: %s", e)
+            finally:
+                pending.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        first = True
+        try:
+            while (item := await pending.get()) is not None:
+                if ws.client_state.name != "CONNECTED":
+                    logger.info("Client disconnected - abandoning the rest of the reply")
+                    break
+                sentence, audio = item
+                if first:
+                    logger.info("First sentence ready in %.2fs", time.time() - start_time)
+                await self.safe_send(ws, sentence, user_text if first else None, append=not first, audio=audio)
+                first = False
+        finally:
+            # Client gone or turn aborted: stop generating and drop unsent TTS downloads
+            producer.cancel()
+            for task in tts_tasks:
+                task.cancel()
+
+        if first:
+            await self.safe_send(ws, KB_TROUBLE_REPLY, user_text)
+
     async def ask_agent(self, session_id: str, user_text: str) -> str:
         try:
             # Use Enhanced RAG Agent for intelligent search
             if self.rag_agent:
-                print(f"🔍 Using Enhanced RAG Agent for query: {user_text}")
+                logger.debug("Using Enhanced RAG Agent for query: %s", user_text)
                 start_time = time.time()
                 try:
-                    response = await asyncio.to_thread(
-                        self.rag_agent.search_and_respond, user_text
+                    response = await run_in(
+                        LLM_EXECUTOR, self.rag_agent.search_and_respond, user_text
                     )
                     elapsed = time.time() - start_time
-                    print(f"✅ Enhanced RAG search completed in {elapsed:.2f}s")
+                    logger.info("Enhanced RAG search completed in %.2fs", elapsed)
                     if response and len(response.strip()) > 10:
                         return response
                     else:
-                        print("⚠️ Enhanced RAG returned empty response")
+                        logger.warning("Enhanced RAG returned empty response")
                 except Exception as rag_error:
-                    print(f"❌ Enhanced RAG error: {rag_error}")
+                    logger.error("Enhanced RAG error: %s", rag_error)
             # Fallback response
-            return "I'm having trouble accessing my knowledge base right now. Could you try rephrasing your question or ask something else?"
+            return KB_TROUBLE_REPLY
         except asyncio.TimeoutError:
-            print(f"⏰ Agentic search timeout")
-            return "I'm taking longer than usual to search. Please try your question again, perhaps with different keywords."
+            logger.warning("Agentic search timeout")
+            return SEARCH_TIMEOUT_REPLY
         except Exception as e:
-            print(f"❌ Agentic search system error: {e}")
-            return "I'm experiencing some technical difficulties. Please try your question again in a moment."
+            logger.error("Agentic search system error: %s", e)
+            return TECHNICAL_ERROR_REPLY
     
     async def _perform_agentic_search(self, query: str) -> str:
         """
         Agentic search approach - uses multiple search strategies
         """
         try:
-            # Strategy 1: Direct query search
-            print(f"🎯 Strategy 1: Direct search for '{query}'")
-            direct_results = self.rag_agent.vector_store.search(query=query, n_results=8)
-            
-            # Strategy 2: Keyword expansion search
+            # Strategy 1 + 2: direct query and keyword expansions, encoded and searched as one batch
+            # (FAISS search + query encoding are blocking CPU work - keep them off the event loop)
             keywords = self._extract_keywords(query)
+            logger.debug("Strategies 1+2: direct search for %r, keyword search for %s", query, keywords)
+            rows = await run_in(
+                RAG_EXECUTOR, self.rag_agent.vector_store.search_batch, [query] + keywords, n_results=8
+            )
+            direct_results = rows[0]
             keyword_results = []
-            if keywords:
-                print(f"🔑 Strategy 2: Keyword search for {keywords}")
-                for keyword in keywords:
-                    kw_results = self.rag_agent.vector_store.search(query=keyword, n_results=5)
-                    keyword_results.extend(kw_results)
+            for kw_results in rows[1:]:
+                keyword_results.extend(kw_results[:5])  # hits are score-ordered, same as n_results=5
             
             # Strategy 3: Context-based search (if previous memory exists)
             context_results = []
@@ -190,7 +322,7 @@ class VoiceAssistant:
             all_results = direct_results + keyword_results + context_results
             unique_results = self._deduplicate_results(all_results)
             
-            print(f"📊 Combined {len(unique_results)} unique results from agentic search")
+            logger.debug("Combined %d unique results from agentic search", len(unique_results))
             
             if not unique_results:
                 return self._get_no_results_agentic_response(query)
@@ -200,61 +332,41 @@ class VoiceAssistant:
             return response
             
         except Exception as e:
-            print(f"❌ Error in agentic search: {e}")
+            logger.error("Error in agentic search: %s", e)
             return "I encountered an error during my search process. Please try rephrasing your question."
     
     def _extract_keywords(self, query: str) -> List[str]:
         """Extract key terms from query for expanded search"""
-        import re
-        
-        # Remove common stop words
-        stop_words = {'the', 'is', 'are', 'what', 'how', 'can', 'do', 'you', 'tell', 'me', 'about', 'find', 'search'}
-        
-        # Extract words (simple approach)
-        words = re.findall(r'\b\w+\b', query.lower())
-        keywords = [word for word in words if len(word) > 3 and word not in stop_words]
+        # Extract words (simple approach), dropping common stop words
+        words = WORD_PATTERN.findall(query.lower())
+        keywords = [word for word in words if len(word) > 3 and word not in KEYWORD_STOP_WORDS]
         
         return keywords[:3]  # Limit to 3 most relevant keywords
     
     def _deduplicate_results(self, results: List[Dict]) -> List[Dict]:
-        """Remove duplicate results based on text similarity"""
+        """Remove duplicate results: one set lookup on a normalized text prefix per result"""
         if not results:
             return []
         
         unique_results = []
-        seen_texts = set()
+        seen_keys = set()
         
-        for result in results:
+        # Best-first, so when two hits share a prefix the higher-scoring one is kept. Not
+        # nlargest(5): duplicates are skipped, so the 5 kept can reach past the top 5 hits.
+        # Every vector-store hit carries 'score', so the key is a C-level itemgetter.
+        for result in sorted(results, key=itemgetter('score'), reverse=True):
             text = result.get('text', '').strip()
-            if text and text not in seen_texts and len(text) > 20:
-                # Check for near-duplicate text
-                is_duplicate = False
-                for seen_text in seen_texts:
-                    if self._texts_similar(text, seen_text):
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate:
-                    unique_results.append(result)
-                    seen_texts.add(text)
-        
-        # Sort by score (descending)
-        unique_results.sort(key=lambda x: x.get('score', 0), reverse=True)
-        return unique_results[:5]  # Top 5 unique results
-    
-    def _texts_similar(self, text1: str, text2: str) -> bool:
-        """Check if two texts are too similar (simple approach)"""
-        if not text1 or not text2:
-            return False
-        
-        # Simple similarity check - if one text is contained in another
-        shorter = text1 if len(text1) < len(text2) else text2
-        longer = text2 if shorter == text1 else text1
+            if len(text) <= 20:
+                continue
+            key = ' '.join(text[:80].lower().split())
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            unique_results.append(result)
+            if len(unique_results) == 5:
+                break
         
-        if len(shorter) > 50 and shorter in longer:
-            return True
-        
-        return False
+        return unique_results  # Top 5 unique results
     
     async def _generate_agentic_response(self, query: str, results: List[Dict]) -> str:
         """
@@ -280,26 +392,11 @@ class VoiceAssistant:
             context = "\n\n".join(context_parts)
             
             # Generate response using existing LLM
-            prompt = f"""You are a helpful voice assistant. Use the provided context to answer the user's question naturally and conversationally.
-
-User Question: {query}
-
-Available Context:
-{context}
-
-Instructions:
-- Provide a natural, conversational response suitable for voice interaction
-- Use information from the context to answer comprehensively
-- If context is limited, acknowledge it but provide what you can
-- Keep the response between 2-4 sentences for voice clarity
-- Be helpful and informative
-- Don't mention technical terms like "database", "search results", or "context"
-
-Response:"""
+            prompt = AGENTIC_ANSWER_PROMPT.format(query=query, context=context)
 
             # Use existing LLM for response generation
-            result = await asyncio.to_thread(
-                self.llm.invoke, prompt
+            result = await run_in(
+                LLM_EXECUTOR, self.llm.invoke, prompt
             )
             
             response_text = result.content if hasattr(result, 'content') else str(result)
@@ -313,7 +410,7 @@ Response:"""
             return response_text
             
         except Exception as e:
-            print(f"❌ Error generating agentic response: {e}")
+            logger.error("Error generating agentic response: %s", e)
             return self._get_fallback_agentic_response(query, results)
     
     def _get_no_results_agentic_response(self, query: str) -> str:
@@ -348,8 +445,7 @@ Response:"""
         text = text.replace(user_text, "").strip()
         
         # Basic cleanup only
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
-        text = text.strip()
+        text = ' '.join(text.split())  # Multiple spaces to single space (C-level split/join)
         
         # Ensure response ends properly
         if text and not text.endswith(('?', '.', '!', ':')):
@@ -363,42 +459,86 @@ Response:"""
     # -------------------------
     # FAST STREAMING TTS + SEND  (REPLACE FULL SECTION)
     # --- PART 1: STREAMING AUDIO SENDER (Chunks wala logic) ---
-    async def safe_send(self, ws: WebSocket, text: str, user_text: str = None):
+    def _start_tts(self, text: str) -> Tuple[asyncio.Queue, asyncio.Task]:
+        """Start streaming TTS for `text`; chunks land in the queue, ending with None (or the error)"""
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        async def fetch():
+            try:
+                async with get_async_openai_client().audio.speech.with_streaming_response.create(
+                    model="tts-1",
+                    voice="alloy",
+                    input=text,
+                    response_format="mp3"
+                ) as response:
+                    async for chunk in response.iter_bytes(chunk_size=TTS_CHUNK_SIZE):
+                        if chunk:
+                            chunks.put_nowait(chunk)
+                chunks.put_nowait(None)
+            except Exception as e:
+                chunks.put_nowait(e)
+
+        return chunks, asyncio.create_task(fetch())
+
+    async def safe_send(self, ws: WebSocket, text: str, user_text: str = None, append: bool = False,
+                        cache: bool = False, audio: Optional[asyncio.Queue] = None):
+        """Send `text`, then its TTS audio (from `audio` if stream_reply already started it)"""
         if ws.client_state.name != "CONNECTED":
             return
 
-        print(f"🎵 Starting Streaming for: {text[:30]}...")
+        # cache=True / canned reply: constant text - replay the audio frames from the first run
+        cache = cache or (audio is None and not append and text in CANNED_REPLIES)
+        cached_frames = self.tts_frame_cache.get(text) if cache else None
+        if cached_frames:
+            await send_frame(ws, {"type": "text_start", "bot_text": text, "user_text": user_text})
+            for frame in cached_frames:
+                if ws.client_state.name != "CONNECTED":
+                    break
+                await ws.send_bytes(frame)
+            return
+
+        logger.debug("Starting TTS stream for: %.30s...", text)
+        tts_task = None
         
         try:
             # STEP 1: Pehle Text/Metadata bhej dein
             # Taaki frontend par text turant dikh jaye
-            await ws.send_json({
-                "type": "text_start",
-                "bot_text": text,
-                "user_text": user_text
-            })
-
-            # STEP 2: OpenAI Streaming API Call
-            # STEP 2: OpenAI Streaming API Call
-            async with client.audio.speech.with_streaming_response.create(
-                model="tts-1",
-                voice="alloy",
-                input=text,
-                response_format="mp3"
-            ) as response:
-                
-                # CHANGE: 24576 -> 4096 (Faster first byte, smoother stream)
-                async for chunk in response.iter_bytes(chunk_size=24576): 
-                    if not chunk: continue
-                    if ws.client_state.name != "CONNECTED": break
+            # (append=True: next sentence of an answer that is already on screen)
+            if append:
+                await send_frame(ws, {"type": "text_append", "bot_text": text})
+            else:
+                await send_frame(ws, {
+                    "type": "text_start",
+                    "bot_text": text,
+                    "user_text": user_text
+                })
 
-                    audio_b64 = base64.b64encode(chunk).decode('utf-8')
-                    await ws.send_json({"type": "audio_chunk", "audio": audio_b64})
-            print("✅ Streaming Finished")
+            # STEP 2: OpenAI Streaming TTS (already running if prefetched)
+            if audio is None:
+                audio, tts_task = self._start_tts(text)
+            frames = [] if cache else None
+            while (chunk := await audio.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if ws.client_state.name != "CONNECTED":
+                    break
+
+                # Raw mp3 bytes as a binary frame - no base64 or JSON on either side
+                await ws.send_bytes(chunk)
+                if frames is not None:
+                    frames.append(chunk)
+            else:
+                # Only a fully streamed answer is reusable
+                if frames:
+                    self.tts_frame_cache[text] = frames
+            logger.debug("TTS stream finished")
 
         except Exception as e:
-            print(f"❌ Streaming Error: {e}")
+            logger.error("TTS streaming error: %s", e)
             # Error bhej sakte hain agar zaroorat ho
             if ws.client_state.name == "CONNECTED":
-                await ws.send_json({"type": "error", "message": "TTS Failed"})
+                await send_frame(ws, {"type": "error", "message": "TTS Failed"})
+        finally:
+            if tts_task is not None:
+                tts_task.cancel()
 